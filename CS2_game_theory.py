@@ -1,8 +1,17 @@
-import nashpy as nash
 import numpy as np
-import matplotlib.pyplot as plt
 import random
-import mplcursors
+import itertools
+import functools
+import collections
+import os
+import statistics
+import json
+import hashlib
+import inspect
+import argparse
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 # Initial conditions:
 
@@ -23,10 +32,205 @@ complete_casual_options_list = [
 win_rewards = [2, 1.5, 1, 1]
 loss_rewards = [1.5, 0.5, -0.5, -2]
 
+complete_options_array = np.array(complete_options_list)
+complete_options_array.flags.writeable = False
+
+# game_matrix_table[i][j] is a read-only view of the top left i by j corner of complete_options_array.
+game_matrix_table = tuple(tuple(complete_options_array[:i, :j] for j in range(0, 5)) for i in range(0, 5))
+
+# Profiling:
+
+# None while profiling is off. Once enable_profiling is called, it holds the number of calls and total wall time of every strategy, engine 
+# phase and pair of strategies, recorded by record_profile.
+profile_stats = None
+
+def enable_profiling():
+    """
+    Turns profiling on with empty statistics. Only the games played in this process are recorded, so worker processes are not included.
+
+    Returns
+    -------
+    None.
+
+    """
+    global profile_stats
+    profile_stats = {"strategy": {}, "phase": {}, "pair": {}}
+
+def disable_profiling():
+    """
+    Turns profiling off and returns the statistics recorded so far.
+
+    Returns
+    -------
+    dict
+        The statistics, in the same form as save_profile writes them.
+
+    """
+    global profile_stats
+    stats = profile_stats
+    profile_stats = None
+    return stats
+
+def record_profile(category, name, seconds, calls=1):
+    """
+    Adds calls and wall time to an entry of the profiling statistics. Only called while profiling is on.
+
+    Parameters
+    ----------
+    category : str
+        "strategy", "phase" or "pair".
+    name : str
+        The name of the strategy, engine phase or pair.
+    seconds : float
+        The wall time to add.
+    calls : int, optional
+        The number of calls to add, which for pairs is the number of games, by default 1.
+
+    Returns
+    -------
+    None.
+
+    """
+    entry = profile_stats[category].setdefault(name, {"calls": 0, "seconds": 0.0})
+    entry["calls"] += calls
+    entry["seconds"] += seconds
+
+def display_profile(stats=None):
+    """
+    Prints the profiling statistics for each category, slowest first, with the number of calls, the total wall time and the mean time 
+    per call. Strategy and lookahead time is also counted in the engine phase it happened in.
+
+    Parameters
+    ----------
+    stats : dict, optional
+        The statistics to print. If None, the statistics recorded so far are used, by default None.
+
+    Returns
+    -------
+    None.
+        Prints the report.
+
+    """
+    if stats is None:
+        stats = profile_stats
+    for category in ["phase", "strategy", "pair"]:
+        print(f"{category:50} {'calls':>12} {'seconds':>12} {'us per call':>12}")
+        for name, entry in sorted(stats[category].items(), key=lambda item: -item[1]["seconds"]):
+            print(f"{name:50} {entry['calls']:12} {entry['seconds']:12.3f} {1e6 * entry['seconds'] / entry['calls']:12.1f}")
+        print()
+
+def save_profile(path, stats=None):
+    """
+    Writes the profiling statistics to a json file of the form {category: {name: {"calls": int, "seconds": float}}}.
+
+    Parameters
+    ----------
+    path : str
+        The file to write.
+    stats : dict, optional
+        The statistics to write. If None, the statistics recorded so far are used, by default None.
+
+    Returns
+    -------
+    None.
+
+    """
+    if stats is None:
+        stats = profile_stats
+    with open(path, "w") as file:
+        json.dump(stats, file, indent=1)
+
+# Rulesets:
+
+Ruleset = collections.namedtuple("Ruleset", ["options", "win_rewards", "loss_rewards", "loss_bonus_ladder", "max_money", 
+                                             "starting_money", "first_to_or_set_number", "play_to", "halftime", "overtime_half_length", 
+                                             "overtime_money", "loss_bonuses", "game_matrix_table", "loss_reward_table"])
+
+def make_ruleset(options_list=complete_options_list, win_rewards=win_rewards, loss_rewards=loss_rewards, 
+                 loss_bonus_ladder=(0, 0.5, 1, 1.5, 2), max_money=15, starting_money=1, first_to_or_set_number="first to", play_to=13, 
+                 halftime=None, overtime_half_length=None, overtime_money=12.5, loss_bonuses=True):
+    """
+    Makes an immutable ruleset holding everything the game engine needs to know about the rules and format of a game, along with 
+    read-only tables of the game matrices and loss rewards worked out from them. A ruleset can be sent to worker processes, and 
+    formats that only differ from another ruleset can be made with its _replace method.
+
+    Parameters
+    ----------
+    options_list : list, optional
+        The matrix of the chance of player 1 winning a round with each option against each option of player 2, by default 
+        complete_options_list.
+    win_rewards : list, optional
+        The money gained for winning a round with each option, by default win_rewards.
+    loss_rewards : list, optional
+        The money gained for losing a round with each option before the loss bonus, by default loss_rewards.
+    loss_bonus_ladder : tuple, optional
+        The extra money for losing a round at each level of loss bonus. A loss moves a player one level up the ladder and a win one 
+        level down, by default (0, 0.5, 1, 1.5, 2).
+    max_money : int or float, optional
+        The maximum money a player can have, by default 15.
+    starting_money : int or float, optional
+        The money both players start with and are reset to at halftime, by default 1.
+    first_to_or_set_number : str, optional
+        If "first to", a game ends when a player reaches play_to points. 
+        If "set number", a game ends after play_to rounds.
+        By default "first to".
+    play_to : int or float, optional
+        The number of points to play to or the number of rounds to play, by default 13.
+    halftime : int, optional
+        The number of rounds after which the players swap sides, if any, by default None.
+    overtime_half_length : int, optional
+        The length of each half of overtime, if ties go to overtime, by default None.
+    overtime_money : int or float, optional
+        The money both players are reset to at the start of each overtime half, by default 12.5.
+    loss_bonuses : bool, optional
+        If False, players stay at the level of the loss bonus ladder they start at instead of moving up and down it, by default True.
+
+    Returns
+    -------
+    Ruleset
+        The ruleset.
+
+    """
+    options = np.array(options_list, dtype=float)
+    options.flags.writeable = False
+    game_matrix_table = tuple(tuple(options[:i, :j] for j in range(0, options.shape[1] + 1)) for i in range(0, options.shape[0] + 1))
+    loss_reward_table = np.array(loss_rewards, dtype=float)[None, :] + np.array(loss_bonus_ladder, dtype=float)[:, None]
+    loss_reward_table.flags.writeable = False
+    return Ruleset(options=options, win_rewards=tuple(win_rewards), loss_rewards=tuple(loss_rewards), 
+                   loss_bonus_ladder=tuple(loss_bonus_ladder), max_money=max_money, starting_money=starting_money, 
+                   first_to_or_set_number=first_to_or_set_number, play_to=play_to, halftime=halftime, 
+                   overtime_half_length=overtime_half_length, overtime_money=overtime_money, loss_bonuses=loss_bonuses, 
+                   game_matrix_table=game_matrix_table, loss_reward_table=loss_reward_table)
+
+def without_loss_bonuses(ruleset):
+    """
+    Gives the same ruleset with loss bonuses turned off.
+
+    Parameters
+    ----------
+    ruleset : Ruleset
+        The ruleset.
+
+    Returns
+    -------
+    Ruleset
+        The ruleset, where players keep the loss bonus they start with for the whole game.
+
+    """
+    return ruleset._replace(loss_bonuses=False)
+
+# the default of two_player_game, first to 13.
+default_ruleset = make_ruleset()
+# the format of accurate_cs_game, two halves of 12 rounds where the first player to 13 wins.
+accurate_ruleset = make_ruleset(max_money=16, halftime=12)
+# the accurate_cs_game format played with complete_casual_options_list.
+casual_ruleset = make_ruleset(options_list=complete_casual_options_list, max_money=16, halftime=12)
+
 def gen_opts(eco1, eco2):
     """
     Generates a submatrix of complete_options_list with number of rows equal to eco1 and number of columns equal to eco2, 
-    thus giving the game matrix for the given stage of the game based on both players eco.
+    thus giving the game matrix for the given stage of the game based on both players eco. The submatrix is looked up in 
+    game_matrix_table so nothing is built or copied.
 
     Parameters
     ----------
@@ -38,22 +242,100 @@ def gen_opts(eco1, eco2):
     Returns
     -------
     np.array
+        A read-only 2D numpy array representing the game matrix for the current stage of the game.
+
+    """
+    return game_matrix_table[max(min(4, int(eco1)), 0)][max(min(4, int(eco2)), 0)]
+
+def play_strategy(player_strat, round_number, eco, op_eco, game_matrix, player0_or_1, n, losses_bonus1, losses_bonus2, first_half, 
+                  points):
+    """
+    Calls a strategy function for one round. Strategies which set a needs_points attribute to True are also given the current score.
+
+    Parameters
+    ----------
+    player_strat : function
+        The strategy function being called.
+    round_number : int
+        The current round number.
+    eco : int or float
+        The economy of the player using the strategy.
+    op_eco : int or float
+        The economy of the opponent.
+    game_matrix : np.array
         A 2D numpy array representing the game matrix for the current stage of the game.
+    player0_or_1 : int
+        0 if the strategy plays as player 1, 1 if it plays as player 2.
+    n : int
+        A chosen value for strategies such as save_first_n_rounds.
+    losses_bonus1 : int
+        The loss bonus of player 1.
+    losses_bonus2 : int
+        The loss bonus of player 2.
+    first_half : bool
+        Whether the round is in the first half of an accurate game.
+    points : tuple
+        The points of player 1 and player 2.
+
+    Returns
+    -------
+    list
+        The probability of the strategy picking each option.
+
+    """
+    if profile_stats is not None:
+        start = time.perf_counter()
+    if getattr(player_strat, "needs_points", False):
+        strat = player_strat(round_number, eco, op_eco, game_matrix, player0_or_1, n, losses_bonus1, losses_bonus2, first_half=first_half, 
+                             points=points)
+    else:
+        strat = player_strat(round_number, eco, op_eco, game_matrix, player0_or_1, n, losses_bonus1, losses_bonus2, first_half=first_half)
+    if profile_stats is not None:
+        record_profile("strategy", player_strat.__name__, time.perf_counter() - start)
+    return strat
+
+def pure_choice(strat):
+    """
+    Gives the option that a pure strategy picks, or None if the strategy is mixed.
+
+    Parameters
+    ----------
+    strat : list or np.array
+        The probability of picking each option.
+
+    Returns
+    -------
+    int or None
+        The index of the option picked with probability 1, or None if there is no such option.
+
+    """
+    if type(strat) is list:
+        return strat.index(1) if 1 in strat else None
+    if np.max(strat) == 1:
+        return int(np.argmax(strat))
+    return None
 
+def game_format_ruleset(ruleset, max_money, first_to_or_set_number, play_to, loss_bonuses, halftime, overtime_half_length, 
+                        overtime_money):
+    """
+    Gives the ruleset that two_player_game and two_player_game_rounds play with, which is ruleset with the parts of its format that they 
+    were given replaced. Parts given as None are left as they are in the ruleset.
     """
-    avaliable_outcomes = []
-    for i in range(0, min(4, int(eco1))):
-        sublist = []
-        for j in range(0, min(4, int(eco2))):
-            sublist.append(complete_options_list[i][j])
-        avaliable_outcomes.append(sublist)
-    return np.array(avaliable_outcomes)
+    game_format = {"max_money": max_money, "first_to_or_set_number": first_to_or_set_number, "play_to": play_to, "halftime": halftime, 
+              "overtime_half_length": overtime_half_length, "overtime_money": overtime_money}
+    ruleset = ruleset._replace(**{key: value for key, value in game_format.items() if value is not None})
+    if loss_bonuses == False:
+        ruleset = without_loss_bonuses(ruleset)
+    return ruleset
 
-def two_player_game(player1_strat, player2_strat, starting_points=(0, 0), starting_money=(1, 1), max_money=15, 
-                    first_to_or_set_number="first to",  play_to=13, n=5, loss_bonuses=True, start_loss_bonus=0):
+def two_player_game(player1_strat, player2_strat, starting_points=(0, 0), starting_money=None, max_money=None, 
+                    first_to_or_set_number=None, play_to=None, n=5, loss_bonuses=True, start_loss_bonus=0, rng=None, history="full", 
+                    halftime=None, overtime_half_length=None, overtime_money=None, ruleset=default_ruleset):
     """
     Plays a game with a given number of rounds or until a player reaches a certain number of points with two strategies against each other 
-    and returns their money over time and points over time.
+    and returns their money over time and points over time. Any part of the format given here replaces that part of the format of the 
+    ruleset, and the parts left as None are taken from the ruleset. The game is played by play_game. Unless history is "final", the 
+    choices of each player are kept in two_player_game.player1choices and two_player_game.player2choices.
 
     Parameters
     ----------
@@ -64,163 +346,339 @@ def two_player_game(player1_strat, player2_strat, starting_points=(0, 0), starti
     starting_points : tuple, optional
         The starting points for player 1 and player 2, by default (0, 0).
     starting_money : tuple, optional
-        The starting money for player 1 and player 2, by default (1, 1).
+        The starting money for player 1 and player 2, by default None which uses the starting money of the ruleset, 1 for 
+        default_ruleset.
     max_money : int or float, optional
-        The maximum money a player can have, by default 15.
+        The maximum money a player can have, by default None which uses the max_money of the ruleset, 15 for default_ruleset.
     first_to_or_set_number : str, optional
         If "first to", the game ends when a player reaches the play_to points. 
         If "set number", the game ends after play_to rounds.
-        By default "first to".
+        By default None which uses the format of the ruleset, "first to" for default_ruleset.
     play_to : int or float, optional
-        The number of points to play to or the number of rounds to play, by default 13.
+        The number of points to play to or the number of rounds to play, by default None which uses the play_to of the ruleset, 13 for 
+        default_ruleset.
     n : int, optional
         A chosen value for strategies such as eco_first_n_rounds, by default 5.
     loss_bonuses : bool, optional
         If True, players receive a loss bonus after losing a round, by default True.
     start_loss_bonus : int, optional
-        The starting loss bonus for both players, by default 0.
+        The starting loss bonus for both players, where anything past the top of the loss bonus ladder starts at the top, by default 0.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator that all of the game's random values are drawn from in one block. If None, the random module is used 
+        one value at a time, by default None.
+    history : str, optional
+        If "full", the points, money and choices of every round are kept in lists.
+        If "compact", they are kept in preallocated numpy arrays instead.
+        If "final", nothing is kept for each round and only the final points and money are returned.
+        By default "full".
+    halftime : int, optional
+        If given in a "first to" game, the players swap sides after this many rounds. Their money is reset to the starting money of the 
+        ruleset, their loss bonuses to start_loss_bonus, and the round numbers given to the strategies start again from 0, by default 
+        None which uses the halftime of the ruleset, none for default_ruleset. To play without the halftime of a ruleset, pass 
+        ruleset._replace(halftime=None).
+    overtime_half_length : int, optional
+        If given in a "first to" game, a tie at play_to - 1 points each goes to overtime instead of the next round deciding the game. 
+        Each overtime is two halves of this many rounds, won by the first player to win overtime_half_length + 1 of its rounds, and is 
+        repeated while it is tied. For MR3 overtime use 3, by default None which uses the overtime of the ruleset, none for 
+        default_ruleset.
+    overtime_money : int or float, optional
+        The money both players are reset to at the start of each overtime half, by default None which uses the overtime_money of the 
+        ruleset, 12.5 for default_ruleset.
+    ruleset : Ruleset, optional
+        The ruleset giving the game matrix, rewards, loss bonus ladder and the rest of the format, by default default_ruleset.
 
     Returns
     -------
     tuple
         A tuple containing two lists; points_over_time and money_over_time.
         points_over_time : list
-            A list of lists, where each inner list contains the points of player 1 and player 2 at each round.
+            A list of lists, where each inner list contains the points of player 1 and player 2 at each round. A 2D numpy array if 
+            history is "compact", or just the final points if history is "final".
         money_over_time : list
-            A list of lists, where each inner list contains the money of player 1 and player 2 at each round.
+            A list of lists, where each inner list contains the money of player 1 and player 2 at each round. A 2D numpy array if 
+            history is "compact", or just the final money if history is "final". At a change of sides this is the money after it 
+            has been reset.
+
+    """
+    ruleset = game_format_ruleset(ruleset, max_money, first_to_or_set_number, play_to, loss_bonuses, halftime, overtime_half_length, 
+                                  overtime_money)
+    points_over_time, money_over_time, choices = play_game(player1_strat, player2_strat, ruleset, starting_points=starting_points, 
+                                                           starting_money=starting_money, n=n, start_loss_bonus=start_loss_bonus, rng=rng, 
+                                                           history=history)
+    two_player_game.player1choices, two_player_game.player2choices = choices
+    return points_over_time, money_over_time
+
+def max_game_rounds(ruleset, starting_points=(0, 0)):
+    """
+    Gives the most rounds a game with the given ruleset and starting points can last, not counting any overtime.
+    """
+    if ruleset.first_to_or_set_number == "first to":
+        return max(int(2 * ruleset.play_to - starting_points[0] - starting_points[1] - 1), 0)
+    return max(int(ruleset.play_to), 0)
+
+def play_game_rounds(player1_strat, player2_strat, ruleset=default_ruleset, starting_points=(0, 0), starting_money=None, n=5, 
+                     start_loss_bonus=0, rng=None):
+    """
+    The game engine. A generator which plays one game of two strategies against each other with the rules and format of a ruleset, and 
+    yields the game one round at a time as it is played.
+
+    Parameters
+    ----------
+    player1_strat : function
+        The strategy function for player 1.
+    player2_strat : function
+        The strategy function for player 2.
+    ruleset : Ruleset, optional
+        The rules and format of the game, by default default_ruleset.
+    starting_points : tuple, optional
+        The starting points for player 1 and player 2, by default (0, 0).
+    starting_money : tuple, optional
+        The starting money for player 1 and player 2. If None, both start with the starting_money of the ruleset, by default None.
+    n : int, optional
+        A chosen value for strategies such as eco_first_n_rounds, by default 5.
+    start_loss_bonus : int, optional
+        The starting loss bonus for both players, where anything past the top of the loss bonus ladder starts at the top, by default 0.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator that all of the game's random values are drawn from in one block. If None, the random module is used 
+        one value at a time, by default None.
+
+    Yields
+    ------
+    tuple
+        A tuple of round_number, p1_choice, p2_choice, points and money for each round, where points and money are lists with the values 
+        for player 1 and player 2 after the round. At a change of sides money is the money after it has been reset. points and money are 
+        the engine's own lists, which the next round changes, so they have to be copied to be kept.
 
     """
+    if starting_money is None:
+        starting_money = (ruleset.starting_money, ruleset.starting_money)
     money = [starting_money[0], starting_money[1]]
     points = [starting_points[0], starting_points[1]]
-    points_over_time = [[starting_points[0],starting_points[1]]]
-    money_over_time = [[starting_money[0],starting_money[1]]]
     round_number = 0
+    max_bonus = len(ruleset.loss_bonus_ladder) - 1
+    start_loss_bonus = min(start_loss_bonus, max_bonus)
     losses_bonus1, losses_bonus2 = start_loss_bonus, start_loss_bonus
-    two_player_game.player1choices = []
-    two_player_game.player2choices = []
-
-    if first_to_or_set_number == "first to":
-        while max(points[0],points[1]) < play_to:
-            game_matrix = gen_opts(money[0], money[1])
-            strat1 = player1_strat(round_number, money[0], money[1], game_matrix, 0, n, losses_bonus1, losses_bonus2, first_half=accurate_cs_game.first_half)
-            strat2 = player2_strat(round_number, money[1], money[0], game_matrix, 1, n, losses_bonus1, losses_bonus2, first_half=accurate_cs_game.first_half)
-            loss_rewards1 = [1.5 + (0.5 * losses_bonus1), 0.5 + (0.5 * losses_bonus1), -0.5 + (0.5 * losses_bonus1), -2 + (0.5 * losses_bonus1)]
-            loss_rewards2 = [1.5 + (0.5 * losses_bonus2), 0.5 + (0.5 * losses_bonus2), -0.5 + (0.5 * losses_bonus2), -2 + (0.5 * losses_bonus2)]
-
-            rand_value = random.random()
-            j = 0
-            for i in range(0, len(strat1)):
-                j += strat1[i]
-                if rand_value < j:
-                    p1_choice = i
-                    break
-            rand_value = random.random()
-            j = 0
-            for i in range(0, len(strat2)):
-                j += strat2[i]
-                if rand_value < j:
-                    p2_choice = i
-                    break
-            two_player_game.player1choices.append(p1_choice)
-            two_player_game.player2choices.append(p2_choice)
-            roll=random.random()
-            if game_matrix[p1_choice][p2_choice] > roll:
-                money[0] += win_rewards[p1_choice]
-                points[0] += 1
-                if loss_bonuses == True:
-                    if losses_bonus2 < 4:
-                        losses_bonus2 += 1
-                    if losses_bonus1 > 0:
-                        losses_bonus1 -= 1
-                money[1] += loss_rewards2[p2_choice]
-                loser=2
-            else:
-                money[1] += win_rewards[p2_choice]
-                points[1] += 1
-                if loss_bonuses == True:
-                    if losses_bonus1 < 4:
-                        losses_bonus1 += 1
-                    if losses_bonus2 > 0:
-                        losses_bonus2 -= 1
-                money[0] += loss_rewards1[p1_choice]
-                loser=1
-            
-            money[0] = min(money[0],max_money)
-            money[1] = min(money[1],max_money)
-            #print("game matrix:\n"+str(game_matrix)+"\np1 strat: "+str(p1_choice+1)+"\np2 strat: "+str(p2_choice+1)+"\n roll: "+str(roll))
-            #print(round_number)
-            #print("player "+str(loser)+" loses and recieves a loss bonus of "+str([losses_bonus1,losses_bonus2][loser-1]))
-            #print("player "+str((loser%2)+1)+" wins and maintains a loss bonus of "+str([losses_bonus2,losses_bonus1][(loser-1)]))
-            #print(losses_bonus1,losses_bonus2)
-            points_over_time.append([points[0], points[1]])
-            money_over_time.append([money[0],money[1]])
-            round_number += 1
-            #print(points_over_time)
+    # without loss bonuses the players stay on the level of the ladder they start on.
+    bonus_step = 1 if ruleset.loss_bonuses == True else 0
+    first_to = ruleset.first_to_or_set_number == "first to"
+    max_money = ruleset.max_money
+    win_rewards = ruleset.win_rewards
+    loss_reward_table = ruleset.loss_reward_table.tolist()
+    game_matrix_table = ruleset.game_matrix_table
+    largest_row = len(game_matrix_table) - 1
+    largest_column = len(game_matrix_table[0]) - 1
+    overtime_half_length = ruleset.overtime_half_length
+    # only strategies which need the score are given it, so that nothing is built for the others each round.
+    needs_points1 = getattr(player1_strat, "needs_points", False)
+    needs_points2 = getattr(player2_strat, "needs_points", False)
+    max_rounds = max_game_rounds(ruleset, starting_points)
+    if rng is not None:
+        rng = np.random.default_rng(rng)
+        uniforms = rng.random((max_rounds, 3)).tolist()
+    first_half = ruleset.halftime is not None
+    target = ruleset.play_to
+    half_round = 0
+    half_length = ruleset.halftime if first_to == True else None
+    half_money = (ruleset.starting_money, ruleset.starting_money)
 
-    else:
-        while round_number < play_to:
-            game_matrix = gen_opts(money[0], money[1])
-            strat1 = player1_strat(round_number, money[0], money[1], game_matrix, 0, n, losses_bonus1, losses_bonus2, first_half=accurate_cs_game.first_half)
-            strat2 = player2_strat(round_number, money[1], money[0], game_matrix, 1, n, losses_bonus1, losses_bonus2, first_half=accurate_cs_game.first_half)
-            loss_rewards1 = [1.5 + (0.5 * losses_bonus1), 0.5 + (0.5 * losses_bonus1), -0.5 + (0.5 * losses_bonus1), -2 + (0.5 * losses_bonus1)]
-            loss_rewards2 = [1.5 + (0.5 * losses_bonus2), 0.5 + (0.5 * losses_bonus2), -0.5 + (0.5 * losses_bonus2), -2 + (0.5 * losses_bonus2)]
-            
-            rand_value = random.random()
+    while (max(points[0], points[1]) < target) if first_to == True else (round_number < target):
+        if round_number == max_rounds:
+            # only reached in overtime, which has no fixed length.
+            max_rounds += 2 * overtime_half_length
+            if rng is not None:
+                uniforms += rng.random((2 * overtime_half_length, 3)).tolist()
+        if profile_stats is not None:
+            start = time.perf_counter()
+        game_matrix = game_matrix_table[max(min(largest_row, int(money[0])), 0)][max(min(largest_column, int(money[1])), 0)]
+        strat1 = play_strategy(player1_strat, half_round, money[0], money[1], game_matrix, 0, n, losses_bonus1, losses_bonus2, 
+                               first_half, (points[0], points[1]) if needs_points1 else None)
+        strat2 = play_strategy(player2_strat, half_round, money[1], money[0], game_matrix, 1, n, losses_bonus1, losses_bonus2, 
+                               first_half, (points[0], points[1]) if needs_points2 else None)
+        if profile_stats is not None:
+            record_profile("phase", "game_strategies", time.perf_counter() - start)
+            start = time.perf_counter()
+        if rng is not None:
+            round_uniforms = uniforms[round_number]
+
+        # pure strategies, which most of the built in strategies are, pick their option without a random value.
+        p1_choice = pure_choice(strat1)
+        if p1_choice is None:
+            rand_value = random.random() if rng is None else round_uniforms[0]
             j = 0
             for i in range(0, len(strat1)):
                 j += strat1[i]
                 if rand_value < j:
                     p1_choice = i
                     break
-            rand_value = random.random()
+        p2_choice = pure_choice(strat2)
+        if p2_choice is None:
+            rand_value = random.random() if rng is None else round_uniforms[1]
             j = 0
             for i in range(0, len(strat2)):
                 j += strat2[i]
                 if rand_value < j:
                     p2_choice = i
                     break
-            two_player_game.player1choices.append(p1_choice)
-            two_player_game.player2choices.append(p2_choice)
-            roll=random.random()
-            if game_matrix[p1_choice][p2_choice] > roll:
-                money[0] += win_rewards[p1_choice]
-                points[0] += 1
-                if loss_bonuses == True:
-                    if losses_bonus2 < 4:
-                        losses_bonus2 += 1
-                    if losses_bonus1 > 0:
-                        losses_bonus1 -= 1
-                money[1] += loss_rewards2[p2_choice]
-                loser=2
-            else:
-                money[1] += win_rewards[p2_choice]
-                points[1] += 1
-                if loss_bonuses == True:
-                    if losses_bonus1 < 4:
-                        losses_bonus1 += 1
-                    if losses_bonus2 > 0:
-                        losses_bonus2 -= 1
-                money[0] += loss_rewards1[p1_choice]
-                loser=1
-            
-            money[0] = min(money[0],max_money)
-            money[1] = min(money[1],max_money)
-            #print("game matrix:\n"+str(game_matrix)+"\np1 strat: "+str(p1_choice+1)+"\np2 strat: "+str(p2_choice+1)+"\n roll: "+str(roll))
-            #print(round_number)
-            #print("player "+str(loser)+" loses and recieves a loss bonus of "+str([losses_bonus1,losses_bonus2][loser-1]))
-            #print("player "+str((loser%2)+1)+" wins and maintains a loss bonus of "+str([losses_bonus2,losses_bonus1][(loser-1)]))
-            #print(losses_bonus1,losses_bonus2)
+        roll = random.random() if rng is None else round_uniforms[2]
+        if profile_stats is not None:
+            record_profile("phase", "game_sampling", time.perf_counter() - start)
+            start = time.perf_counter()
+        if game_matrix[p1_choice][p2_choice] > roll:
+            money[0] += win_rewards[p1_choice]
+            money[1] += loss_reward_table[losses_bonus2][p2_choice]
+            points[0] += 1
+            losses_bonus1 = max(losses_bonus1 - bonus_step, 0)
+            losses_bonus2 = min(losses_bonus2 + bonus_step, max_bonus)
+        else:
+            money[1] += win_rewards[p2_choice]
+            money[0] += loss_reward_table[losses_bonus1][p1_choice]
+            points[1] += 1
+            losses_bonus1 = min(losses_bonus1 + bonus_step, max_bonus)
+            losses_bonus2 = max(losses_bonus2 - bonus_step, 0)
+        
+        money[0] = min(money[0],max_money)
+        money[1] = min(money[1],max_money)
+        half_round += 1
+        if first_to == True and overtime_half_length is not None and points[0] == points[1] == target - 1:
+            target += overtime_half_length
+            half_length = overtime_half_length
+            half_money = (ruleset.overtime_money, ruleset.overtime_money)
+            half_round = 0
+            first_half = True
+            money[0], money[1] = half_money
+            losses_bonus1, losses_bonus2 = start_loss_bonus, start_loss_bonus
+        elif half_round == half_length:
+            half_length = None
+            half_round = 0
+            first_half = False
+            money[0], money[1] = half_money
+            losses_bonus1, losses_bonus2 = start_loss_bonus, start_loss_bonus
+        if profile_stats is not None:
+            record_profile("phase", "game_update", time.perf_counter() - start)
+        yield round_number, p1_choice, p2_choice, points, money
+        round_number += 1
+
+def play_game(player1_strat, player2_strat, ruleset=default_ruleset, starting_points=(0, 0), starting_money=None, n=5, 
+              start_loss_bonus=0, rng=None, history="full"):
+    """
+    Plays one game of two strategies against each other with play_game_rounds, and returns their points over time, money over time and 
+    choices.
+
+    Parameters
+    ----------
+    player1_strat : function
+        The strategy function for player 1.
+    player2_strat : function
+        The strategy function for player 2.
+    ruleset : Ruleset, optional
+        The rules and format of the game, by default default_ruleset.
+    starting_points : tuple, optional
+        The starting points for player 1 and player 2, by default (0, 0).
+    starting_money : tuple, optional
+        The starting money for player 1 and player 2. If None, both start with the starting_money of the ruleset, by default None.
+    n : int, optional
+        A chosen value for strategies such as eco_first_n_rounds, by default 5.
+    start_loss_bonus : int, optional
+        The starting loss bonus for both players, where anything past the top of the loss bonus ladder starts at the top, by default 0.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator that all of the game's random values are drawn from in one block. If None, the random module is used 
+        one value at a time, by default None.
+    history : str, optional
+        If "full", the points, money and choices of every round are kept in lists.
+        If "compact", they are kept in preallocated numpy arrays instead.
+        If "final", nothing is kept for each round and only the final points and money are returned.
+        By default "full".
+
+    Returns
+    -------
+    tuple
+        A tuple containing points_over_time, money_over_time and choices. points_over_time and money_over_time are the same as for 
+        two_player_game.
+        choices : tuple
+            A tuple of the choices of player 1 and of player 2 in each round, as lists if history is "full" or numpy arrays if history is 
+            "compact". Both are None if history is "final".
+
+    """
+    if profile_stats is not None:
+        start = time.perf_counter()
+    if starting_money is None:
+        starting_money = (ruleset.starting_money, ruleset.starting_money)
+    points = [starting_points[0], starting_points[1]]
+    money = [starting_money[0], starting_money[1]]
+    rounds = play_game_rounds(player1_strat, player2_strat, ruleset, starting_points=starting_points, starting_money=starting_money, n=n, 
+                              start_loss_bonus=start_loss_bonus, rng=rng)
+    if history == "full":
+        points_over_time = [[starting_points[0],starting_points[1]]]
+        money_over_time = [[starting_money[0],starting_money[1]]]
+        player1choices = []
+        player2choices = []
+        for round_number, p1_choice, p2_choice, points, money in rounds:
+            player1choices.append(p1_choice)
+            player2choices.append(p2_choice)
             points_over_time.append([points[0], points[1]])
             money_over_time.append([money[0],money[1]])
-            round_number += 1
-            #print(points_over_time)
+        choices = (player1choices, player2choices)
+    elif history == "compact":
+        max_rounds = max_game_rounds(ruleset, starting_points)
+        points_over_time = np.zeros((max_rounds + 1, 2), dtype=int)
+        money_over_time = np.zeros((max_rounds + 1, 2))
+        choices = np.zeros((max_rounds, 2), dtype=np.int8)
+        points_over_time[0] = points
+        money_over_time[0] = money
+        round_number = -1
+        for round_number, p1_choice, p2_choice, points, money in rounds:
+            if round_number == len(choices):
+                # only reached in overtime, which has no fixed length.
+                extra_rounds = max(len(choices), 1)
+                choices = np.concatenate((choices, np.zeros((extra_rounds, 2), dtype=np.int8)))
+                points_over_time = np.concatenate((points_over_time, np.zeros((extra_rounds, 2), dtype=int)))
+                money_over_time = np.concatenate((money_over_time, np.zeros((extra_rounds, 2))))
+            choices[round_number] = p1_choice, p2_choice
+            points_over_time[round_number + 1] = points
+            money_over_time[round_number + 1] = money
+        points_over_time = points_over_time[:round_number + 2]
+        money_over_time = money_over_time[:round_number + 2]
+        choices = (choices[:round_number + 1, 0], choices[:round_number + 1, 1])
+    else:
+        for round_number, p1_choice, p2_choice, points, money in rounds:
+            pass
+        points_over_time, money_over_time = points, money
+        choices = (None, None)
+    if profile_stats is not None:
+        record_profile("phase", "play_game", time.perf_counter() - start)
+    return points_over_time, money_over_time, choices
+
+def two_player_game_rounds(player1_strat, player2_strat, starting_points=(0, 0), starting_money=None, max_money=None, 
+                           first_to_or_set_number=None, play_to=None, n=5, loss_bonuses=True, start_loss_bonus=0, rng=None, 
+                           halftime=None, overtime_half_length=None, overtime_money=None, ruleset=default_ruleset):
+    """
+    A generator which plays a game of two_player_game one round at a time with play_game_rounds, yielding each round as it is played 
+    without keeping any history.
+
+    Parameters
+    ----------
+    The same as two_player_game, apart from history.
+
+    Yields
+    ------
+    tuple
+        A tuple of round_number, p1_choice, p2_choice, points and money for each round, where points and money are tuples with the values 
+        for player 1 and player 2 after the round.
 
-    return points_over_time.copy(), money_over_time.copy()
+    """
+    ruleset = game_format_ruleset(ruleset, max_money, first_to_or_set_number, play_to, loss_bonuses, halftime, overtime_half_length, 
+                                  overtime_money)
+    for round_number, p1_choice, p2_choice, points, money in play_game_rounds(player1_strat, player2_strat, ruleset, 
+                                                                              starting_points=starting_points, 
+                                                                              starting_money=starting_money, n=n, 
+                                                                              start_loss_bonus=start_loss_bonus, rng=rng):
+        yield round_number, p1_choice, p2_choice, (points[0], points[1]), (money[0], money[1])
 
 def extensive_form_game_into_normal_form_2_rounds(eco_player1, eco_player2, loss_reward_mult_player1, loss_reward_mult_player2):
     """
     Takes the current economy of both players and the loss reward multipliers for both players and returns the index of the best option for 
-    player 1 to play in the current round by considering the expected outcomes of the next two rounds.
+    player 1 to play in the current round by considering the expected outcomes of the next two rounds. As strategies are not given the 
+    ruleset, this uses the default rules in complete_options_list, win_rewards and loss_rewards.
 
     Parameters
     ----------
@@ -331,6 +789,129 @@ def extensive_form_game_into_normal_form_2_rounds(eco_player1, eco_player2, loss
     index_of_max = maximum_row_sums.index(max(maximum_row_sums))
     return index_of_max
 
+# max_row_mean_table[i][j] is the largest row mean of game_matrix_table[i][j], or -inf when that matrix has no rows or columns.
+max_row_mean_table = np.full((5, 5), -np.inf)
+max_row_mean_table[1:, 1:] = [[complete_options_array[:i, :j].mean(axis=1).max() for j in range(1, 5)] for i in range(1, 5)]
+max_row_mean_table.flags.writeable = False
+
+def extensive_form_game_into_normal_form_2_rounds_vectorized(eco_player1, eco_player2, loss_reward_mult_player1, 
+                                                             loss_reward_mult_player2):
+    """
+    A vectorized version of extensive_form_game_into_normal_form_2_rounds which computes the expected outcomes of the next two rounds 
+    for every pair of options at once using max_row_mean_table instead of building and bucketing every next round game matrix. Like 
+    extensive_form_game_into_normal_form_2_rounds, it only supports the default rules.
+
+    Parameters
+    ----------
+    eco_player1 : int or float
+        The economy of player 1 at this stage of the game.
+    eco_player2 : int or float
+        The economy of player 2 at this stage of the game.
+    loss_reward_mult_player1 : int or float
+        The loss reward multiplier for player 1 at the current stage of the game.
+    loss_reward_mult_player2 : int or float
+        The loss reward multiplier for player 2 at the currnet stage of the game.
+    
+    Returns
+    -------
+    int
+        The index of the best option for player 1 to play in the current round.
+    
+    """
+    starting_game_matrix = gen_opts(eco1=eco_player1, eco2=eco_player2)
+    rows, columns = starting_game_matrix.shape
+    if rows == 0 or columns == 0:
+        return None
+    win_rewards_array = np.array(win_rewards, dtype=float)
+    loss_rewards_array = np.array(loss_rewards, dtype=float)
+    win_player1eco = np.clip(eco_player1 + win_rewards_array[:rows], 0, 4).astype(int)
+    loss_player2eco = np.clip(eco_player2 + loss_reward_mult_player2 * 0.5 + loss_rewards_array[:columns], 0, 4).astype(int)
+    loss_player1eco = np.clip(eco_player1 + loss_reward_mult_player1 * 0.5 + loss_rewards_array[:rows], 0, 4).astype(int)
+    win_player2eco = np.clip(eco_player2 + win_rewards_array[:columns], 0, 4).astype(int)
+    best_after_win = (starting_game_matrix * max_row_mean_table[win_player1eco[:, None], loss_player2eco[None, :]] 
+                      + starting_game_matrix).max(axis=1)
+    best_after_loss = ((1 - starting_game_matrix) * max_row_mean_table[loss_player1eco[:, None], win_player2eco[None, :]] 
+                       + starting_game_matrix).max(axis=1)
+    return int(np.argmax(best_after_win + best_after_loss))
+
+two_rounds_decision_cache = {}
+
+def two_rounds_decision(eco_player1, eco_player2, loss_reward_mult_player1, loss_reward_mult_player2):
+    """
+    Looks up the best option for player 1 including the next two rounds in two_rounds_decision_cache, working it out with
+    extensive_form_game_into_normal_form_2_rounds_vectorized the first time each state is seen.
+
+    Parameters
+    ----------
+    eco_player1 : int or float
+        The economy of player 1 at this stage of the game.
+    eco_player2 : int or float
+        The economy of player 2 at this stage of the game.
+    loss_reward_mult_player1 : int or float
+        The loss reward multiplier for player 1 at the current stage of the game.
+    loss_reward_mult_player2 : int or float
+        The loss reward multiplier for player 2 at the currnet stage of the game.
+    
+    Returns
+    -------
+    int
+        The index of the best option for player 1 to play in the current round.
+
+    """
+    key = (eco_player1, eco_player2, loss_reward_mult_player1, loss_reward_mult_player2)
+    if key not in two_rounds_decision_cache:
+        if profile_stats is not None:
+            start = time.perf_counter()
+        two_rounds_decision_cache[key] = extensive_form_game_into_normal_form_2_rounds_vectorized(*key)
+        if profile_stats is not None:
+            record_profile("phase", "two_rounds_lookahead", time.perf_counter() - start)
+    return two_rounds_decision_cache[key]
+
+equilibrium_cache = {}
+
+def first_equilibrium(game_matrix):
+    """
+    Returns the first nash equilibrium that support enumeration finds for a game matrix, looking it up in equilibrium_cache by the 
+    matrix's shape and contents so that support enumeration only runs once per distinct matrix.
+
+    Parameters
+    ----------
+    game_matrix : np.array
+        A 2D numpy array representing the game matrix for the current stage of the game.
+
+    Returns
+    -------
+    tuple
+        A tuple containing two read-only numpy arrays; the strategies of player 1 and player 2 in the equilibrium.
+
+    """
+    game_matrix = np.asarray(game_matrix, dtype=float)
+    key = (game_matrix.shape, game_matrix.tobytes())
+    if key not in equilibrium_cache:
+        import nashpy as nash
+        if profile_stats is not None:
+            start = time.perf_counter()
+        equilibrium = tuple(np.array(strat) for strat in next(nash.Game(game_matrix).support_enumeration()))
+        if profile_stats is not None:
+            record_profile("phase", "support_enumeration", time.perf_counter() - start)
+        for strat in equilibrium:
+            strat.flags.writeable = False
+        equilibrium_cache[key] = equilibrium
+    return equilibrium_cache[key]
+
+def warm_equilibrium_cache():
+    """
+    Fills equilibrium_cache with the equilibria of all 16 game matrices that gen_opts can return.
+
+    Returns
+    -------
+    None.
+
+    """
+    for i in range(1, 5):
+        for j in range(1, 5):
+            first_equilibrium(game_matrix_table[i][j])
+
 ### THE STRAT ZONE ###
 
 def support_enumerator_strat(round_number, eco, op_eco, game_matrix, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, first_half=False):
@@ -338,9 +919,7 @@ def support_enumerator_strat(round_number, eco, op_eco, game_matrix, player0_or_
     A strategy which picks short term nash equilibria for the current round.
     """
     support_enumerator_strat.stratname = "support enumerated"
-    equilibria = nash.Game(game_matrix).support_enumeration()
-    eq = next(equilibria)
-    strat = list(eq)
+    strat = list(first_equilibrium(game_matrix))
     #print(f"player {player0_or_1} has strat:{strat[player0_or_1]} giving odds {complete_options_list[list(strat[player0_or_1]).index(1)]}")
     return strat[player0_or_1]
 
@@ -488,7 +1067,7 @@ def bi4nxt_2_rounds(round_number, eco, op_eco, game_matrix, player0_or_1=0, n=5,
     """
     bi4nxt_2_rounds.stratname = "buy for next 2 rounds"
     strat = [0] * min(int(eco), 4)
-    index_of_choice = extensive_form_game_into_normal_form_2_rounds(eco, op_eco, losses_bonus1, losses_bonus2)
+    index_of_choice = two_rounds_decision(eco, op_eco, losses_bonus1, losses_bonus2)
     strat[index_of_choice] = 1
     return strat
 
@@ -497,9 +1076,7 @@ def support_enumerator_strat2(round_number, eco, op_eco, game_matrix, player0_or
     A strategy which picks short term nash equilibria for the current round and always takes the largest buy on the last rounds.
     """
     support_enumerator_strat2.stratname = "support enumerated 2"
-    equilibria = nash.Game(game_matrix).support_enumeration()
-    eq = next(equilibria)
-    strat = list(eq)
+    strat = list(first_equilibrium(game_matrix))
     if round_number == 12:
         strat = short_term(round_number, eco, op_eco, game_matrix, player0_or_1=0)
     if round_number == 11 and first_half == True:
@@ -621,7 +1198,7 @@ def bi4nxt_2_rounds2(round_number, eco, op_eco, game_matrix, player0_or_1=0, n=5
     """
     bi4nxt_2_rounds2.stratname = "buy for next 2 rounds pt.2"
     strat = [0] * min(int(eco), 4)
-    index_of_choice = extensive_form_game_into_normal_form_2_rounds(eco, op_eco, losses_bonus1, losses_bonus2)
+    index_of_choice = two_rounds_decision(eco, op_eco, losses_bonus1, losses_bonus2)
     strat[index_of_choice] = 1
     if round_number == 12:
         strat = short_term(round_number, eco, op_eco, game_matrix, player0_or_1=0)
@@ -641,11 +1218,38 @@ def save_til_death2(round_number, eco, op_eco, game_matrix, player0_or_1=0, n=0,
         strat = short_term(round_number, eco, op_eco, game_matrix, player0_or_1=0)
     return strat
 
-### now leaving THE STRAT ZONE ###
-
-def accurate_cs_game(strat1, strat2, n=5, loss_bonuses=True):
+def backward_induction_strat(round_number, eco, op_eco, game_matrix, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, first_half=False, 
+                            points=(0, 0)):
     """
-    A function to create an accurate game of counterstrike.
+    A strategy which plays the subgame perfect mixed strategy of an accurate game found by backward induction over the whole game.
+    """
+    backward_induction_strat.stratname = "backward induction"
+    policy_index, mixed_strats = get_backward_induction_policy()
+    eco_index = min(int(2 * eco) - 2, policy_index.shape[2] - 1)
+    op_eco_index = min(int(2 * op_eco) - 2, policy_index.shape[3] - 1)
+    # rounds played after the game is already won do not matter, so they use the policy for one point short of winning.
+    points1, points2 = min(points[0], policy_index.shape[0] - 1), min(points[1], policy_index.shape[0] - 1)
+    if player0_or_1 == 0:
+        option = int(policy_index[points1, points2, eco_index, op_eco_index, losses_bonus1, losses_bonus2])
+    else:
+        option = int(policy_index[points2, points1, eco_index, op_eco_index, losses_bonus2, losses_bonus1])
+    options = min(int(eco), 4)
+    if option >= 0:
+        strat = [0] * options
+        strat[option] = 1
+        return strat
+    strat = mixed_strats[-1 - option, :options].astype(float)
+    return (strat / strat.sum()).tolist()
+
+backward_induction_strat.needs_points = True
+
+### now leaving THE STRAT ZONE ###
+
+def accurate_cs_game(strat1, strat2, n=5, loss_bonuses=True, rng=None, history="full", overtime=False, ruleset=accurate_ruleset):
+    """
+    A function to create an accurate game of counterstrike. The game is played in one pass, with the players swapping sides at the 
+    halftime of the ruleset and the game stopping as soon as a player reaches its play_to points, after 12 rounds and at 13 points for 
+    accurate_ruleset.
 
     Parameters
     ----------
@@ -657,175 +1261,507 @@ def accurate_cs_game(strat1, strat2, n=5, loss_bonuses=True):
         A chosen value for strategies such as save_first_n_rounds, by default 5.
     loss_bonuses : bool, optional
         If True, players receive a loss bonus after losing a round, by default True.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator that the game draws its random values from. If None, the random module is used, by default None.
+    history : str, optional
+        If "full", the points, money and choices of every round are kept in lists.
+        If "compact", they are kept in numpy arrays instead.
+        If "final", nothing is kept for each round and only the final points and money are returned.
+        By default "full".
+    overtime : bool, optional
+        If True, a 12-12 tie goes to MR3 overtime instead of the next round deciding the game, by default False.
+    ruleset : Ruleset, optional
+        The rules and format of the game, such as casual_ruleset, by default accurate_ruleset.
 
     Returns
     -------
     tuple
         A tuple containing two lists; points_over_time and money_over_time.
         points_over_time : list
-            A list of lists, where each inner list contains the points of player 1 and player 2 at each round.
+            A list of lists, where each inner list contains the points of player 1 and player 2 at each round. A 2D numpy array if 
+            history is "compact", or just the final points if history is "final".
         money_over_time : list
-            A list of lists, where each inner list contains the money of player 1 and player 2 at each round.
-
-    """
-    accurate_cs_game.player1choices = []
-    accurate_cs_game.player2choices = []
-    accurate_cs_game.first_half = True
-    points_over_time, money_over_time = two_player_game(player1_strat=strat1, player2_strat=strat2, starting_points=(0, 0), max_money=16, 
-                                                        first_to_or_set_number="set number", play_to=12, n=n, loss_bonuses=loss_bonuses)
-    accurate_cs_game.player1choices.append(two_player_game.player1choices)
-    accurate_cs_game.player2choices.append(two_player_game.player2choices)
-    accurate_cs_game.first_half = False
-    next_half_points_over_time, next_half_money_over_time = two_player_game(player1_strat=strat1, player2_strat=strat2, 
-                                                                            starting_points=(0, 0),starting_money=(1, 1), max_money=16, 
-                                                                            first_to_or_set_number="set number", play_to=13, n=n, 
-                                                                            loss_bonuses=loss_bonuses)
-    accurate_cs_game.player1choices.append(two_player_game.player1choices)
-    accurate_cs_game.player2choices.append(two_player_game.player2choices)
-    for i in next_half_points_over_time:
-        points_over_time.append([points_over_time[12][0] + i[0], points_over_time[12][1] + i[1]])
-    for i in next_half_money_over_time:
-        money_over_time.append(i)
-    for i in range(0, len(points_over_time)):
-        if max(points_over_time[i]) >= 13:
-            del points_over_time[i + 1:]
-            del money_over_time[i + 1:]
-            break
+            A list of lists, where each inner list contains the money of player 1 and player 2 at each round. A 2D numpy array if 
+            history is "compact", or just the final money if history is "final".
+
+    """
+    if overtime == True:
+        ruleset = ruleset._replace(overtime_half_length=3)
+    if loss_bonuses == False:
+        ruleset = without_loss_bonuses(ruleset)
+    points_over_time, money_over_time, (player1choices, player2choices) = play_game(strat1, strat2, ruleset, n=n, rng=rng, 
+                                                                                    history=history)
+    if history != "final":
+        halftime = ruleset.halftime if ruleset.halftime is not None else len(player1choices)
+        accurate_cs_game.player1choices = [player1choices[:halftime], player1choices[halftime:]]
+        accurate_cs_game.player2choices = [player2choices[:halftime], player2choices[halftime:]]
     return points_over_time, money_over_time
 
-def unpack_points_over_time_and_money_over_time(game_outcome, money_outcome):
+# Batch strategies:
+
+# A batch strategy is called with round_number, eco, op_eco, player0_or_1, n, losses_bonus1, losses_bonus2 and first_half like a strategy, 
+# but eco, op_eco and the loss bonuses are numpy arrays with one value per match. It returns a 2D numpy array of shape (number of matches, 4) 
+# with the probability of each option, which is 0 for options the player can not afford. A strategy with a batch version has it as its 
+# batch_strategy attribute.
+
+def batch_pick(choices):
     """
-    A function to take game_outcome and money_outcome and from that return each teams scores and money at all rounds.
+    Turns the index of the option picked in each match into the probabilities of a pure batch strategy.
 
     Parameters
     ----------
-    game_outcome : list
-        A list of lists, where each inner list contains the points of player 1 and player 2 at each round.
-    money_outcome : list
-        A list of lists, where each inner list contains the money of player 1 and player 2 at each round.
-    
+    choices : np.array
+        The index of the option picked in each match.
+
+    Returns
+    -------
+    np.array
+        A 2D numpy array of shape (number of matches, 4) with a probability of 1 for the picked option.
+
+    """
+    probabilities = np.zeros((len(choices), 4))
+    probabilities[np.arange(len(choices)), choices] = 1
+    return probabilities
+
+def batch_full_buy_choice(eco):
+    """
+    The index of the option short_term picks in each match, the largest option the player can afford.
+    """
+    return np.minimum(np.asarray(eco).astype(int), 4) - 1
+
+def batch_last_round(round_number, first_half):
+    """
+    Whether each round is the last round of a half, where the "2" strategies always take the largest buy.
+    """
+    return (np.asarray(round_number) == 12) | ((np.asarray(round_number) == 11) & (np.asarray(first_half) == True))
+
+def batch_short_term(round_number, eco, op_eco, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, first_half=False):
+    """
+    A batch version of short_term.
+    """
+    return batch_pick(batch_full_buy_choice(eco))
+
+def batch_save_til_n_eco(round_number, eco, op_eco, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, first_half=False):
+    """
+    A batch version of save_til_n_eco.
+    """
+    return batch_pick(np.where(np.asarray(eco) < n, 0, batch_full_buy_choice(eco)))
+
+def batch_save_first_n_rounds(round_number, eco, op_eco, player0_or_1=0, n=5, losses_bonus1=0, losses_bonus2=0, first_half=False):
+    """
+    A batch version of save_first_n_rounds.
+    """
+    return batch_pick(np.where(np.asarray(round_number) < n, 0, batch_full_buy_choice(eco)))
+
+def batch_save_if_down_on_money(round_number, eco, op_eco, player0_or_1=0, n=5, losses_bonus1=0, losses_bonus2=0, first_half=False):
+    """
+    A batch version of save_if_down_on_money.
+    """
+    return batch_pick(np.where(np.asarray(eco) < np.asarray(op_eco), 0, batch_full_buy_choice(eco)))
+
+def batch_bi4nxt(round_number, eco, op_eco, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, first_half=False):
+    """
+    A batch version of bi4nxt.
+    """
+    eco = np.asarray(eco)
+    return batch_pick(np.select([eco < 3.5, eco == 3.5], [0, 1], 3))
+
+def batch_never_half(round_number, eco, op_eco, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, first_half=False):
+    """
+    A batch version of never_half.
+    """
+    eco = np.asarray(eco)
+    return batch_pick(np.where((eco < 3) | (eco > 4), batch_full_buy_choice(eco), 1))
+
+def batch_save_til_n_eco2(round_number, eco, op_eco, player0_or_1=0, n=5, losses_bonus1=0, losses_bonus2=0, first_half=False):
+    """
+    A batch version of save_til_n_eco2.
+    """
+    return batch_pick(np.where((np.asarray(eco) < n) & ~batch_last_round(round_number, first_half), 0, batch_full_buy_choice(eco)))
+
+def batch_save_first_n_rounds2(round_number, eco, op_eco, player0_or_1=0, n=5, losses_bonus1=0, losses_bonus2=0, first_half=False):
+    """
+    A batch version of save_first_n_rounds2.
+    """
+    save = (np.asarray(round_number) < n) & ~batch_last_round(round_number, first_half)
+    return batch_pick(np.where(save, 0, batch_full_buy_choice(eco)))
+
+def batch_save_if_down_on_money2(round_number, eco, op_eco, player0_or_1=0, n=5, losses_bonus1=0, losses_bonus2=0, first_half=False):
+    """
+    A batch version of save_if_down_on_money2.
+    """
+    save = (np.asarray(eco) < np.asarray(op_eco)) & ~batch_last_round(round_number, first_half)
+    return batch_pick(np.where(save, 0, batch_full_buy_choice(eco)))
+
+def batch_bi4nxt2(round_number, eco, op_eco, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, first_half=False):
+    """
+    A batch version of bi4nxt2.
+    """
+    eco = np.asarray(eco)
+    choices = np.select([eco < 3.5, eco == 3.5], [0, 1], 3)
+    return batch_pick(np.where(batch_last_round(round_number, first_half), batch_full_buy_choice(eco), choices))
+
+def batch_never_half2(round_number, eco, op_eco, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, first_half=False):
+    """
+    A batch version of never_half2.
+    """
+    eco = np.asarray(eco)
+    short_term_rounds = (eco < 3) | (eco > 4) | batch_last_round(round_number, first_half)
+    return batch_pick(np.where(short_term_rounds, batch_full_buy_choice(eco), 1))
+
+short_term.batch_strategy = batch_short_term
+save_til_n_eco.batch_strategy = batch_save_til_n_eco
+save_first_n_rounds.batch_strategy = batch_save_first_n_rounds
+save_if_down_on_money.batch_strategy = batch_save_if_down_on_money
+bi4nxt.batch_strategy = batch_bi4nxt
+never_half.batch_strategy = batch_never_half
+save_til_n_eco2.batch_strategy = batch_save_til_n_eco2
+save_first_n_rounds2.batch_strategy = batch_save_first_n_rounds2
+save_if_down_on_money2.batch_strategy = batch_save_if_down_on_money2
+bi4nxt2.batch_strategy = batch_bi4nxt2
+never_half2.batch_strategy = batch_never_half2
+
+def legacy_batch_strategy(player_strat, round_number, eco, op_eco, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, 
+                          first_half=False, points=None):
+    """
+    A batch strategy which plays a strategy that only decides for one match at a time, calling it once per unique state in the batch. 
+    Used through as_batch_strategy. The round number and first_half must be shared by every match.
+    """
+    eco = np.asarray(eco, dtype=float)
+    op_eco = np.broadcast_to(np.asarray(op_eco, dtype=float), eco.shape)
+    money = np.column_stack((eco, op_eco) if player0_or_1 == 0 else (op_eco, eco))
+    state_columns = [money, np.broadcast_to(losses_bonus1, eco.shape), np.broadcast_to(losses_bonus2, eco.shape)]
+    if getattr(player_strat, "needs_points", False) and points is not None:
+        state_columns.append(points)
+    states, inverse = np.unique(np.column_stack(state_columns), axis=0, return_inverse=True)
+    probabilities = batch_strategy_probabilities(player_strat, round_number, states, player0_or_1, n, first_half)[0]
+    return probabilities[inverse.reshape(-1)]
+
+def as_batch_strategy(player_strat):
+    """
+    Gives the batch version of a strategy, or wraps a strategy without one with legacy_batch_strategy.
+
+    Parameters
+    ----------
+    player_strat : function
+        The strategy function.
+
+    Returns
+    -------
+    function
+        A batch strategy.
+
+    """
+    if hasattr(player_strat, "batch_strategy"):
+        return player_strat.batch_strategy
+    return functools.partial(legacy_batch_strategy, player_strat)
+
+# Batch engine:
+
+def batch_strategy_probabilities(player_strat, round_number, states, player0_or_1, n=5, first_half=False):
+    """
+    Evaluates a strategy once for every unique state in a batch of matches and returns the option probabilities as an array.
+
+    Parameters
+    ----------
+    player_strat : function
+        The strategy function being evaluated.
+    round_number : int
+        The current round number, shared by every match in the batch.
+    states : np.array
+        A 2D numpy array with one row per unique state and columns money of player 1, money of player 2, loss bonus of player 1,
+        loss bonus of player 2 and, when a strategy needs the score, points of player 1 and points of player 2.
+    player0_or_1 : int
+        0 if the strategy plays as player 1, 1 if it plays as player 2.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+    first_half : bool, optional
+        Whether the rounds are being played in the first half of an accurate game, by default False.
+
     Returns
     -------
     tuple
-        A tuple containing four lists; team1score, team2score, team1money and team2money.
-        team1score : list
-            A list of the scores over rounds of player 1.
-        team2score : list
-            A list of the scores over rounds of player 2.
-        team1money : list
-            A list of the money over rounds of player 1.
-        team2money : list
-            A list of the money over rounds of player 2.
+        A tuple containing two numpy arrays; probabilities and number_of_options.
+        probabilities : np.array
+            A 2D numpy array of shape (number of states, 4) with the probability of picking each option, padded with zeros.
+        number_of_options : np.array
+            The number of options the strategy returned for each state.
 
     """
-    team1score=[]
-    team2score=[]
-    team1money=[]
-    team2money=[]
-    for i in game_outcome:
-        team1score.append(i[0])
-        team2score.append(i[1])
+    probabilities = np.zeros((len(states), 4))
+    number_of_options = np.zeros(len(states), dtype=int)
+    for k, state in enumerate(states.tolist()):
+        money1, money2, losses_bonus1, losses_bonus2 = state[:4]
+        points = (int(state[4]), int(state[5])) if len(state) == 6 else (0, 0)
+        game_matrix = gen_opts(money1, money2)
+        if player0_or_1 == 0:
+            strat = play_strategy(player_strat, round_number, money1, money2, game_matrix, 0, n, int(losses_bonus1), int(losses_bonus2),
+                                  first_half, points)
+        else:
+            strat = play_strategy(player_strat, round_number, money2, money1, game_matrix, 1, n, int(losses_bonus1), int(losses_bonus2),
+                                  first_half, points)
+        probabilities[k, :len(strat)] = strat
+        number_of_options[k] = len(strat)
+    return probabilities, number_of_options
 
-    for i in money_outcome:
-        team1money.append(i[0])
-        team2money.append(i[1])
-    return team1score, team2score, team1money, team2money
+def batch_round_probabilities(player_strat, round_number, money, losses_bonus, points, player0_or_1, n=5, first_half=False):
+    """
+    Finds the option probabilities of a strategy for every match in a batch for one round. Compiled strategies are looked up in their 
+    table directly, and any other strategy is played through as_batch_strategy, so strategies with a batch_strategy are called once for 
+    the whole batch and the rest once per unique state.
+
+    Parameters
+    ----------
+    player_strat : function
+        The strategy function being evaluated.
+    round_number : int
+        The current round number, shared by every match in the batch.
+    money : np.array
+        A 2D numpy array with the money of player 1 and player 2 in each match.
+    losses_bonus : np.array
+        A 2D numpy array with the loss bonus of player 1 and player 2 in each match.
+    points : np.array
+        A 2D numpy array with the points of player 1 and player 2 in each match.
+    player0_or_1 : int
+        0 if the strategy plays as player 1, 1 if it plays as player 2.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+    first_half : bool, optional
+        Whether the rounds are being played in the first half of an accurate game, by default False.
+
+    Returns
+    -------
+    tuple
+        A tuple containing two numpy arrays; probabilities and number_of_options.
+        probabilities : np.array
+            A 2D numpy array of shape (number of matches, 4) with the probability of picking each option, padded with zeros.
+        number_of_options : np.array
+            The number of options the strategy can pick from in each match.
 
-def graph_it_out(team1score, team2score, team1money, team2money, strat1, strat2, first_to=13, max_money=15):
     """
-    A function to graph out a comparison of money and points for each team from the given lists.
+    if profile_stats is not None:
+        start = time.perf_counter()
+        result = batch_strategy_round_probabilities(player_strat, round_number, money, losses_bonus, points, player0_or_1, n, first_half)
+        # legacy strategies are also recorded once per unique state by play_strategy, so the whole batch call is kept apart.
+        record_profile("strategy", player_strat.__name__ + " (batch)", time.perf_counter() - start)
+        return result
+    return batch_strategy_round_probabilities(player_strat, round_number, money, losses_bonus, points, player0_or_1, n, first_half)
+
+def batch_strategy_round_probabilities(player_strat, round_number, money, losses_bonus, points, player0_or_1, n=5, first_half=False):
+    """
+    The body of batch_round_probabilities, which takes the same arguments and gives the same output.
+    """
+    if hasattr(player_strat, "strategy_table"):
+        return table_strategy_probabilities(player_strat.strategy_table, round_number, money, losses_bonus, player0_or_1, first_half)
+    batch_strat = as_batch_strategy(player_strat)
+    eco = money[:, player0_or_1]
+    if getattr(player_strat, "needs_points", False):
+        probabilities = batch_strat(round_number, eco, money[:, 1 - player0_or_1], player0_or_1, n, losses_bonus[:, 0], losses_bonus[:, 1], 
+                                    first_half, points=points)
+    else:
+        probabilities = batch_strat(round_number, eco, money[:, 1 - player0_or_1], player0_or_1, n, losses_bonus[:, 0], losses_bonus[:, 1], 
+                                    first_half)
+    return probabilities, np.minimum(eco.astype(int), 4)
+
+def batch_sample_choices(probabilities, number_of_options, rand_values):
+    """
+    Picks an option for every match in a batch the same way two_player_game does, by finding the first option whose cumulative
+    probability is greater than the random value.
 
     Parameters
     ----------
-    team1score : list
-        A list of the scores over rounds of player 1.
-    team2score : list
-        A list of the scores over rounds of player 2.
-    team1money : list
-        A list of the money over rounds of player 1.
-    team2money : list
-        A list of the money over rounds of player 2.
-    strat1 : function
-        The strategy function for player 1.
-    strat2 : function
-        The strategy function for player 2.
-    first_to : int or float, optional
-        The number of round wins a player needs to win the game, by default 13.
-    max_money : int or float, optional
-        The maximum amount of money that a player can have at any given round, by default 15.
+    probabilities : np.array
+        A 2D numpy array of shape (number of matches, 4) with the probability of picking each option.
+    number_of_options : np.array
+        The number of options avaliable in each match.
+    rand_values : np.array
+        One uniform random value in [0, 1) per match.
 
     Returns
     -------
-    None. 
-        Displays the graph to compare the points over time and money over time for each team.
+    np.array
+        The index of the chosen option for each match.
 
     """
-    fig, (ax1, ax2) = plt.subplots(2, figsize = (16, 8.1))
-    ax_2a = ax1.twinx()
-    ax_2b = ax2.twinx()
-    ax1.set_title("Team 1: " + strat1.stratname)
-    ax2.set_title("Team 2: " + strat2.stratname)
-    ax1.set_ylabel("wins")
-    ax2.set_xlabel("round")
-    ax2.set_ylabel("wins")
-    ax_2a.set_ylabel("eco")
-    ax_2b.set_ylabel("eco")
-    ax1.step(range(0,len(team1score)),team1score, linewidth=5)
-    ax2.step(range(0,len(team2score)),team2score, linewidth=5,color="red")
-    ax_2a.step(range(0,len(team1score)), team1money, linewidth=2.5,color="green")
-    ax_2b.step(range(0,len(team2score)), team2money, linewidth=2.5,color="forestgreen")
-    ax1.set(ylim=(0, first_to))
-    ax2.set(ylim=(0, first_to))
-    ax_2a.set(ylim=(1, max_money))
-    ax_2b.set(ylim=(1, max_money))
+    cumulative = np.cumsum(probabilities, axis=1)
+    choices = np.sum(cumulative <= rand_values[:, None], axis=1)
+    return np.minimum(choices, number_of_options - 1)
 
-    plt.show()
+def batch_draw_choices(probabilities, number_of_options, rng=None, rand_values=None):
+    """
+    Picks an option for every row of a batch, where the rows can be both players of many matches at once. Rows of pure strategies take 
+    their option straight away without a random value, and only the rows of mixed strategies are sampled with batch_sample_choices.
+
+    Parameters
+    ----------
+    probabilities : np.array
+        A 2D numpy array of shape (number of rows, 4) with the probability of picking each option.
+    number_of_options : np.array
+        The number of options avaliable in each row.
+    rng : np.random.Generator, optional
+        The generator that the random values of the mixed rows are drawn from, if rand_values is not given, by default None.
+    rand_values : np.array, optional
+        One uniform random value in [0, 1) per row, of which only the values of mixed rows are used, by default None.
+
+    Returns
+    -------
+    np.array
+        The index of the chosen option for each row.
 
-def find_possible_strategies(play_to=13, repetitions=10_000, accurate_game=False, n=5):
     """
-    A function to use the random strategy repeatedly to find what the possible strategies are in a full normal game.
-    
+    choices = np.argmax(probabilities, axis=1)
+    mixed = np.flatnonzero(probabilities[np.arange(len(choices)), choices] != 1)
+    if len(mixed) != 0:
+        mixed_rand_values = rng.random(len(mixed)) if rand_values is None else rand_values[mixed]
+        choices[mixed] = batch_sample_choices(probabilities[mixed], number_of_options[mixed], mixed_rand_values)
+    return choices
+
+def batch_two_player_game(player1_strat, player2_strat, m=1_000, starting_points=(0, 0), starting_money=None, max_money=None,
+                          first_to_or_set_number=None, play_to=None, n=5, loss_bonuses=True, start_loss_bonus=0, first_half=False,
+                          rng=None, common_random_numbers=False, game_log=None, game_log_round_offset=0, ruleset=default_ruleset):
+    """
+    Plays m games of two strategies against each other at once, keeping the money, points and loss bonuses of every game in numpy arrays
+    and stepping all unfinished games forward together. Follows the same rules as two_player_game, but each strategy is only called once
+    per unique state in a round rather than once per game.
+
     Parameters
     ----------
+    player1_strat : function
+        The strategy function for player 1.
+    player2_strat : function
+        The strategy function for player 2.
+    m : int, optional
+        The number of games played at once, by default 1,000.
+    starting_points : tuple or np.array, optional
+        The starting points for player 1 and player 2, either shared by all games or one row per game, by default (0, 0).
+    starting_money : tuple or np.array, optional
+        The starting money for player 1 and player 2, either shared by all games or one row per game, by default None which uses the 
+        starting money of the ruleset.
+    max_money : int or float, optional
+        The maximum money a player can have, by default None which uses the max_money of the ruleset.
+    first_to_or_set_number : str, optional
+        If "first to", a game ends when a player reaches the play_to points.
+        If "set number", the games end after play_to rounds.
+        By default None which uses the format of the ruleset.
     play_to : int or float, optional
-        The required number of round wins for a player to win a game, by default 13.
-    repetitions : int, optional
-        number of games to be tried to find possible strategies, by default 10,000.
-    accurate_game : bool, optional
-        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False.
+        The number of points to play to or the number of rounds to play, by default None which uses the play_to of the ruleset.
     n : int, optional
-        A chosen value for strategies such as save_first_n_rounds, by default 5.
+        A chosen value for strategies such as eco_first_n_rounds, by default 5.
+    loss_bonuses : bool, optional
+        If True, players receive a loss bonus after losing a round, by default True.
+    start_loss_bonus : int, optional
+        The starting loss bonus for both players, where anything past the top of the loss bonus ladder starts at the top, by default 0.
+    first_half : bool, optional
+        Whether the games are the first half of an accurate game, passed on to the strategies, by default False.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator that each round's block of random values is drawn from, by default None.
+    common_random_numbers : bool, optional
+        If True, random values are drawn for every game each round, even finished ones, so that game k in round r always gets the same 
+        values from the same rng no matter how the strategies play, by default False.
+    game_log : dict, optional
+        A game log from create_game_log that every round of every game is written to. Game k is given the match id 
+        game_log["matches"] + k, by default None.
+    game_log_round_offset : int, optional
+        The number added to the round numbers written to the game log, by default 0.
+    ruleset : Ruleset, optional
+        The ruleset giving the game matrix, rewards, loss bonus ladder and any part of the format that is not given. Its halftime and 
+        overtime are not played, by default default_ruleset.
 
     Returns
     -------
-    int
-        The length of the list of all found strategies.
+    tuple
+        A tuple containing two numpy arrays; points and money.
+        points : np.array
+            A 2D numpy array of shape (m, 2) with the final points of player 1 and player 2 in each game.
+        money : np.array
+            A 2D numpy array of shape (m, 2) with the final money of player 1 and player 2 in each game.
 
     """
-    strat1 = random_strat
-    strat2 = random_strat
-    possible_strategies = []
-    for i in range(repetitions):
-        print(str(100 * i / repetitions) + " percent complete")
-        if accurate_game == False:
-            current_points_over_time, current_money_over_time = two_player_game(player1_strat=strat1, player2_strat=strat2, max_money=16, 
-                                                                                first_to_or_set_number="first to", play_to=play_to, 
-                                                                                loss_bonuses=True, n=n)
-            if two_player_game.player1choices not in possible_strategies:
-                possible_strategies.append(two_player_game.player1choices)
-            if two_player_game.player2choices not in possible_strategies:
-                possible_strategies.append(two_player_game.player2choices)
+    if starting_money is None:
+        starting_money = (ruleset.starting_money, ruleset.starting_money)
+    if max_money is None:
+        max_money = ruleset.max_money
+    if first_to_or_set_number is None:
+        first_to_or_set_number = ruleset.first_to_or_set_number
+    if play_to is None:
+        play_to = ruleset.play_to
+    points = np.zeros((m, 2), dtype=int)
+    points[:] = starting_points
+    money = np.zeros((m, 2))
+    money[:] = starting_money
+    if loss_bonuses == False:
+        ruleset = without_loss_bonuses(ruleset)
+    max_bonus = len(ruleset.loss_bonus_ladder) - 1
+    losses_bonus = np.full((m, 2), min(start_loss_bonus, max_bonus), dtype=int)
+    options = ruleset.options
+    win_rewards_array = np.array(ruleset.win_rewards, dtype=float)
+    loss_reward_table = ruleset.loss_reward_table
+    rng = np.random.default_rng(rng)
+    round_number = 0
+
+    while True:
+        if first_to_or_set_number == "first to":
+            active = np.flatnonzero(points.max(axis=1) < play_to)
+        elif round_number < play_to:
+            active = np.arange(m)
         else:
-            current_points_over_time, current_money_over_time = accurate_cs_game(strat1=strat1, strat2=strat2, n=n, loss_bonuses=True)
-            if accurate_cs_game.player1choices not in possible_strategies:
-                possible_strategies.append(accurate_cs_game.player1chocies)
-            if accurate_cs_game.player2choices not in possible_strategies:
-                possible_strategies.append(accurate_cs_game.player2chocies)
-    return len(possible_strategies)
+            break
+        if len(active) == 0:
+            break
+
+        if profile_stats is not None:
+            start = time.perf_counter()
+        probabilities1, number_of_options1 = batch_round_probabilities(player1_strat, round_number, money[active], losses_bonus[active], 
+                                                                       points[active], 0, n, first_half)
+        probabilities2, number_of_options2 = batch_round_probabilities(player2_strat, round_number, money[active], losses_bonus[active], 
+                                                                       points[active], 1, n, first_half)
+        if profile_stats is not None:
+            record_profile("phase", "batch_strategies", time.perf_counter() - start)
+            start = time.perf_counter()
+        # both players are sampled together, and outside of common random numbers only the mixed strategies use up random values.
+        probabilities = np.concatenate((probabilities1, probabilities2))
+        number_of_options = np.concatenate((number_of_options1, number_of_options2))
+        if common_random_numbers == True:
+            uniforms = rng.random((3, m))[:, active]
+            choices = batch_draw_choices(probabilities, number_of_options, rand_values=uniforms[:2].reshape(-1))
+            roll = uniforms[2]
+        else:
+            choices = batch_draw_choices(probabilities, number_of_options, rng=rng)
+            roll = rng.random(len(active))
+        p1_choice = choices[:len(active)]
+        p2_choice = choices[len(active):]
+        if profile_stats is not None:
+            record_profile("phase", "batch_sampling", time.perf_counter() - start)
+            start = time.perf_counter()
+        p1_wins = options[p1_choice, p2_choice] > roll
+        if game_log is not None:
+            append_game_log(game_log, match_id=game_log["matches"] + active, round=round_number + game_log_round_offset, 
+                            player1_choice=p1_choice, player2_choice=p2_choice, roll=roll, player1_won=p1_wins, 
+                            player1_points=points[active, 0], player2_points=points[active, 1], player1_money=money[active, 0], 
+                            player2_money=money[active, 1], player1_loss_bonus=losses_bonus[active, 0], 
+                            player2_loss_bonus=losses_bonus[active, 1])
+
+        losses_bonus1 = losses_bonus[active, 0]
+        losses_bonus2 = losses_bonus[active, 1]
+        money[active, 0] += np.where(p1_wins, win_rewards_array[p1_choice], loss_reward_table[losses_bonus1, p1_choice])
+        money[active, 1] += np.where(p1_wins, loss_reward_table[losses_bonus2, p2_choice], win_rewards_array[p2_choice])
+        points[active, 0] += p1_wins
+        points[active, 1] += ~p1_wins
+        if ruleset.loss_bonuses == True:
+            losses_bonus[active, 0] = np.where(p1_wins, np.maximum(losses_bonus1 - 1, 0), np.minimum(losses_bonus1 + 1, max_bonus))
+            losses_bonus[active, 1] = np.where(p1_wins, np.minimum(losses_bonus2 + 1, max_bonus), np.maximum(losses_bonus2 - 1, 0))
+        np.minimum(money, max_money, out=money)
+        round_number += 1
+        if profile_stats is not None:
+            record_profile("phase", "batch_update", time.perf_counter() - start)
 
-def play_m_games(strat1, strat2, n=5, m=100, play_to=13, accurate_game=False):
+    return points, money
+
+def batch_accurate_cs_game(strat1, strat2, m=1_000, n=5, loss_bonuses=True, rng=None, common_random_numbers=False, game_log=None, 
+                           ruleset=accurate_ruleset):
     """
-    A function to play m full games of two given strategies against each other.
+    Plays m accurate games of counterstrike at once with the batch engine, stopping each game as soon as a team reaches 13 points. The 
+    batch engine does not play overtime.
 
     Parameters
     ----------
@@ -833,115 +1769,1748 @@ def play_m_games(strat1, strat2, n=5, m=100, play_to=13, accurate_game=False):
         The strategy function for player 1.
     strat2 : function
         The strategy function for player 2.
+    m : int, optional
+        The number of games played at once, by default 1,000.
     n : int, optional
         A chosen value for strategies such as save_first_n_rounds, by default 5.
-    m : int, optional
-        The number of games played between the strategies, by default 100.
-    play_to : int or float, optional
-        The required number of round wins for a player to win a game, by default 13.
-    accurate_game : bool, optional
-        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False
+    loss_bonuses : bool, optional
+        If True, players receive a loss bonus after losing a round, by default True.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator that both halves draw their random values from, by default None.
+    common_random_numbers : bool, optional
+        If True, game k in round r always gets the same random values from the same rng, by default False.
+    game_log : dict, optional
+        A game log from create_game_log that every round of both halves is written to, by default None.
+    ruleset : Ruleset, optional
+        The rules and format of the games, such as casual_ruleset, by default accurate_ruleset.
 
     Returns
     -------
-    list
-        A list of the two players final scores after the m games.
+    tuple
+        A tuple containing two numpy arrays; points and money.
+        points : np.array
+            A 2D numpy array of shape (m, 2) with the final points of player 1 and player 2 in each game.
+        money : np.array
+            A 2D numpy array of shape (m, 2) with the final money of player 1 and player 2 in each game.
 
     """
-    scores = [0, 0]
-    for i in range(0, m):
-        if accurate_game == False:
-            gamescore = two_player_game(player1_strat=strat1, player2_strat=strat2, n=n, play_to=play_to)[0][-1]
-            winner = gamescore.index(max(gamescore))
-        else:
-            gamescore = accurate_cs_game(strat1=strat1, strat2=strat2, n=n, loss_bonuses=True)[0][-1]
-            winner = gamescore.index(max(gamescore))
-        scores[winner] += 1
-    return scores
+    if ruleset.overtime_half_length is not None:
+        raise ValueError("the batch engine does not play overtime")
+    rng = np.random.default_rng(rng)
+    starting_money = (ruleset.starting_money, ruleset.starting_money)
+    if ruleset.halftime is None:
+        return batch_two_player_game(player1_strat=strat1, player2_strat=strat2, m=m, starting_money=starting_money, 
+                                     max_money=ruleset.max_money, first_to_or_set_number=ruleset.first_to_or_set_number, 
+                                     play_to=ruleset.play_to, n=n, loss_bonuses=loss_bonuses, rng=rng, 
+                                     common_random_numbers=common_random_numbers, game_log=game_log, ruleset=ruleset)
+    first_half_points, first_half_money = batch_two_player_game(player1_strat=strat1, player2_strat=strat2, m=m, 
+                                                                starting_money=starting_money, max_money=ruleset.max_money,
+                                                                first_to_or_set_number="set number", play_to=ruleset.halftime, n=n,
+                                                                loss_bonuses=loss_bonuses, first_half=True, rng=rng, 
+                                                                common_random_numbers=common_random_numbers, game_log=game_log, 
+                                                                ruleset=ruleset)
+    return batch_two_player_game(player1_strat=strat1, player2_strat=strat2, m=m, starting_points=first_half_points,
+                                 starting_money=starting_money, max_money=ruleset.max_money, first_to_or_set_number="first to", 
+                                 play_to=ruleset.play_to, n=n, loss_bonuses=loss_bonuses, first_half=False, rng=rng, 
+                                 common_random_numbers=common_random_numbers, game_log=game_log, 
+                                 game_log_round_offset=ruleset.halftime, ruleset=ruleset)
 
-def compare_save_first_n_with_other_strategies_for_different_n(save_first_n_selection=save_first_n_rounds, other_strategy=short_term, 
-                                                               play_to=13, number_of_games=1_000, accurate_game=False):
+# Game logs:
+
+game_log_columns = {
+                    "match_id": "uint32",
+                    "round": "uint8",
+                    "player1_choice": "uint8",
+                    "player2_choice": "uint8",
+                    "roll": "float32",
+                    "player1_won": "bool",
+                    "player1_points": "uint8",
+                    "player2_points": "uint8",
+                    "player1_money": "float16",
+                    "player2_money": "float16",
+                    "player1_loss_bonus": "uint8",
+                    "player2_loss_bonus": "uint8"
+                    }
+
+def create_game_log(path):
     """
-    A function to return winrates of save first n against another strategy for varying values of n, from 0 to the play_to value.
+    Creates an empty game log, a folder with one fixed width binary file per column in game_log_columns that rounds are appended to as 
+    they are played. Each row is one round of one match, with the points, money and loss bonuses at the start of the round. Any game log 
+    already in the folder is replaced.
 
     Parameters
     ----------
-    save_first_n_selection : function, optional
-        The chosen strategy which depends on n, such as save_first_n_rounds_then_lil_then_short_term, by default save_first_n_rounds.
-    other_strategy : function, optional
-        The chosen strategy to play against the save_first_n_selection strategy, by default short_term.
-    play_to : int or float, optional
-        The required number of round wins for a player to win a game, by default 13.
-    number_of_games : int, optional
-        The given number of games for the player 1 strategy to play against player 2 strategy, by default 1,000.
+    path : str
+        The folder to keep the game log in.
+
+    Returns
+    -------
+    dict
+        The open game log, holding its path, the open column files, the number of rows written and the number of matches.
+
+    """
+    os.makedirs(path, exist_ok=True)
+    files = {column: open(os.path.join(path, column + ".bin"), "wb") for column in game_log_columns}
+    return {"path": path, "files": files, "rows": 0, "matches": 0}
+
+def append_game_log(game_log, **columns):
+    """
+    Writes a block of rounds to the end of every column of a game log.
+
+    Parameters
+    ----------
+    game_log : dict
+        The open game log from create_game_log.
+    **columns : np.array or int
+        The values for each column in game_log_columns, either one per round or one shared by the whole block.
+
+    Returns
+    -------
+    None.
+
+    """
+    rows = max(np.size(value) for value in columns.values())
+    for column, dtype in game_log_columns.items():
+        np.broadcast_to(np.asarray(columns[column]).astype(dtype), (rows,)).tofile(game_log["files"][column])
+    game_log["rows"] += rows
+
+def close_game_log(game_log):
+    """
+    Closes the column files of a game log and writes the number of rows and matches next to them, so that it can be loaded.
+
+    Parameters
+    ----------
+    game_log : dict
+        The open game log from create_game_log.
+
+    Returns
+    -------
+    None.
+
+    """
+    for file in game_log["files"].values():
+        file.close()
+    with open(os.path.join(game_log["path"], "game_log.json"), "w") as file:
+        json.dump({"columns": game_log_columns, "rows": game_log["rows"], "matches": game_log["matches"]}, file)
+
+def load_game_log(path):
+    """
+    Loads every column of a game log as a read only memory mapped numpy array, so that only the parts of it that are used are read from 
+    disk.
+
+    Parameters
+    ----------
+    path : str
+        The folder the game log is kept in.
+
+    Returns
+    -------
+    dict
+        A dictionary from each column name to its numpy array.
+
+    """
+    with open(os.path.join(path, "game_log.json")) as file:
+        metadata = json.load(file)
+    if metadata["rows"] == 0:
+        return {column: np.zeros(0, dtype=dtype) for column, dtype in metadata["columns"].items()}
+    return {column: np.memmap(os.path.join(path, column + ".bin"), dtype=dtype, mode="r", shape=(metadata["rows"],)) 
+            for column, dtype in metadata["columns"].items()}
+
+def log_games(strat1, strat2, path, m=1_000_000, chunk_size=100_000, n=5, accurate_game=True, play_to=13, loss_bonuses=True, rng=None):
+    """
+    Plays m games with the batch engine in chunks of chunk_size games, streaming every round of every game into a game log, so that 
+    millions of games can be logged without keeping them in memory.
+
+    Parameters
+    ----------
+    strat1 : function
+        The strategy function for player 1.
+    strat2 : function
+        The strategy function for player 2.
+    path : str
+        The folder to keep the game log in.
+    m : int, optional
+        The number of games to play, by default 1,000,000.
+    chunk_size : int, optional
+        The number of games played at once, by default 100,000.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default True.
+    play_to : int, optional
+        The number of round wins needed to win when not an accurate game, by default 13.
+    loss_bonuses : bool, optional
+        If True, players receive a loss bonus after losing a round, by default True.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator for the games, by default None.
+
+    Returns
+    -------
+    dict
+        The game log, loaded with load_game_log.
+
+    """
+    rng = np.random.default_rng(rng)
+    game_log = create_game_log(path)
+    try:
+        while game_log["matches"] < m:
+            games = min(chunk_size, m - game_log["matches"])
+            if accurate_game == True:
+                batch_accurate_cs_game(strat1, strat2, m=games, n=n, loss_bonuses=loss_bonuses, rng=rng, game_log=game_log)
+            else:
+                batch_two_player_game(strat1, strat2, m=games, play_to=play_to, n=n, loss_bonuses=loss_bonuses, rng=rng, 
+                                      game_log=game_log)
+            game_log["matches"] += games
+    finally:
+        close_game_log(game_log)
+    return load_game_log(path)
+
+# Exact evaluator:
+
+def markov_two_player_game(player1_strat, player2_strat, distribution, max_money=None, first_to_or_set_number=None, play_to=None, n=5, 
+                           loss_bonuses=True, first_half=False, ruleset=default_ruleset):
+    """
+    Pushes a probability distribution over game states through the rules of two_player_game round by round instead of sampling, so 
+    that the chance of every final state is found exactly. The strategies must only depend on the arguments they are given. The halftime 
+    and overtime of the ruleset are not played, so each half is pushed through separately.
+
+    Parameters
+    ----------
+    player1_strat : function
+        The strategy function for player 1.
+    player2_strat : function
+        The strategy function for player 2.
+    distribution : dict
+        A dictionary mapping each starting state (points1, points2, money1, money2, losses_bonus1, losses_bonus2) to its probability.
+    max_money : int or float, optional
+        The maximum money a player can have, by default None which uses the max_money of the ruleset.
+    first_to_or_set_number : str, optional
+        If "first to", a state is final when a player reaches the play_to points.
+        If "set number", the states are final after play_to rounds.
+        By default None which uses the format of the ruleset.
+    play_to : int or float, optional
+        The number of points to play to or the number of rounds to play, by default None which uses the play_to of the ruleset.
+    n : int, optional
+        A chosen value for strategies such as eco_first_n_rounds, by default 5.
+    loss_bonuses : bool, optional
+        If True, players receive a loss bonus after losing a round, by default True.
+    first_half : bool, optional
+        Whether the rounds are the first half of an accurate game, passed on to the strategies, by default False.
+    ruleset : Ruleset, optional
+        The ruleset giving the game matrix, rewards, loss bonus ladder and any part of the format that is not given, by default 
+        default_ruleset.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping each final state (points1, points2, money1, money2, losses_bonus1, losses_bonus2) to its probability.
+
+    """
+    if max_money is None:
+        max_money = ruleset.max_money
+    if first_to_or_set_number is None:
+        first_to_or_set_number = ruleset.first_to_or_set_number
+    if play_to is None:
+        play_to = ruleset.play_to
+    if loss_bonuses == False:
+        ruleset = without_loss_bonuses(ruleset)
+    max_bonus = len(ruleset.loss_bonus_ladder) - 1
+    bonus_step = 1 if ruleset.loss_bonuses == True else 0
+    win_rewards = ruleset.win_rewards
+    loss_reward_table = ruleset.loss_reward_table.tolist()
+    game_matrix_table = ruleset.game_matrix_table
+    largest_row = len(game_matrix_table) - 1
+    largest_column = len(game_matrix_table[0]) - 1
+    final_distribution = {}
+    needs_points = getattr(player1_strat, "needs_points", False) or getattr(player2_strat, "needs_points", False)
+    round_number = 0
+    while len(distribution) != 0:
+        if first_to_or_set_number != "first to" and round_number >= play_to:
+            for state, probability in distribution.items():
+                final_distribution[state] = final_distribution.get(state, 0) + probability
+            break
+        next_distribution = {}
+        round_strats = {}
+        for state, probability in distribution.items():
+            points1, points2, money1, money2, losses_bonus1, losses_bonus2 = state
+            if first_to_or_set_number == "first to" and max(points1, points2) >= play_to:
+                final_distribution[state] = final_distribution.get(state, 0) + probability
+                continue
+            game_matrix = game_matrix_table[max(min(largest_row, int(money1)), 0)][max(min(largest_column, int(money2)), 0)]
+            if needs_points == True:
+                strat_key = state
+            else:
+                strat_key = (money1, money2, losses_bonus1, losses_bonus2)
+            if strat_key not in round_strats:
+                round_strats[strat_key] = (
+                    play_strategy(player1_strat, round_number, money1, money2, game_matrix, 0, n, losses_bonus1, losses_bonus2, 
+                                  first_half, (points1, points2)),
+                    play_strategy(player2_strat, round_number, money2, money1, game_matrix, 1, n, losses_bonus1, losses_bonus2, 
+                                  first_half, (points1, points2)))
+            strat1, strat2 = round_strats[strat_key]
+            p1_win_bonuses = (max(losses_bonus1 - bonus_step, 0), min(losses_bonus2 + bonus_step, max_bonus))
+            p2_win_bonuses = (min(losses_bonus1 + bonus_step, max_bonus), max(losses_bonus2 - bonus_step, 0))
+            for i in range(0, len(strat1)):
+                if strat1[i] == 0:
+                    continue
+                for j in range(0, len(strat2)):
+                    if strat2[j] == 0:
+                        continue
+                    choice_probability = probability * strat1[i] * strat2[j]
+                    p1_win_state = (points1 + 1, points2, min(money1 + win_rewards[i], max_money), 
+                                    min(money2 + loss_reward_table[losses_bonus2][j], max_money)) + p1_win_bonuses
+                    p2_win_state = (points1, points2 + 1, min(money1 + loss_reward_table[losses_bonus1][i], max_money), 
+                                    min(money2 + win_rewards[j], max_money)) + p2_win_bonuses
+                    next_distribution[p1_win_state] = (next_distribution.get(p1_win_state, 0) 
+                                                       + choice_probability * game_matrix[i][j])
+                    next_distribution[p2_win_state] = (next_distribution.get(p2_win_state, 0) 
+                                                       + choice_probability * (1 - game_matrix[i][j]))
+        distribution = next_distribution
+        round_number += 1
+    return final_distribution
+
+def exact_win_probability(strat1, strat2, n=5, play_to=13, accurate_game=False, loss_bonuses=True, ruleset=None):
+    """
+    Finds the exact probability of each strategy winning a full game against the other with markov_two_player_game, giving the value 
+    that play_m_games estimates without any sampling noise. Overtime can not be evaluated exactly.
+
+    Parameters
+    ----------
+    strat1 : function
+        The strategy function for player 1.
+    strat2 : function
+        The strategy function for player 2.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+    play_to : int or float, optional
+        The required number of round wins for a player to win a game, by default 13.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False
+    loss_bonuses : bool, optional
+        If True, players receive a loss bonus after losing a round, by default True.
+    ruleset : Ruleset, optional
+        The ruleset the games are played with, as in play_m_games. If None, accurate_ruleset or default_ruleset is used, by default None.
+
+    Returns
+    -------
+    list
+        A list of the probabilities of player 1 and player 2 winning the game.
+
+    """
+    if ruleset is None:
+        ruleset = accurate_ruleset if accurate_game == True else default_ruleset
+    if accurate_game == False:
+        ruleset = ruleset._replace(first_to_or_set_number="first to", play_to=play_to, halftime=None, overtime_half_length=None)
+    if ruleset.overtime_half_length is not None:
+        raise ValueError("overtime can not be evaluated exactly")
+    starting_state = (0, 0, ruleset.starting_money, ruleset.starting_money, 0, 0)
+    if ruleset.halftime is None or ruleset.first_to_or_set_number != "first to":
+        final_distribution = markov_two_player_game(strat1, strat2, {starting_state: 1.0}, n=n, loss_bonuses=loss_bonuses, 
+                                                    ruleset=ruleset)
+    else:
+        first_half_distribution = markov_two_player_game(strat1, strat2, {starting_state: 1.0}, first_to_or_set_number="set number", 
+                                                         play_to=ruleset.halftime, n=n, loss_bonuses=loss_bonuses, first_half=True, 
+                                                         ruleset=ruleset)
+        second_half_distribution = {}
+        for state, probability in first_half_distribution.items():
+            second_half_state = (state[0], state[1]) + starting_state[2:]
+            second_half_distribution[second_half_state] = second_half_distribution.get(second_half_state, 0) + probability
+        final_distribution = markov_two_player_game(strat1, strat2, second_half_distribution, n=n, loss_bonuses=loss_bonuses, 
+                                                    ruleset=ruleset)
+    player1_win_probability = 0
+    for state, probability in final_distribution.items():
+        if state[0] > state[1]:
+            player1_win_probability += probability
+    return [float(player1_win_probability), float(1 - player1_win_probability)]
+
+# Backward induction:
+
+def batch_solve_zero_sum_games(payoffs, tolerance=1e-9):
+    """
+    Solves many small zero sum games at once, where player 1 wants to maximise the payoff and player 2 wants to minimise it. Saddle points 
+    are found first, then every square support is tried for the remaining games by solving the indifference equations, and any game left 
+    over is solved with the nashpy linear program.
+
+    Parameters
+    ----------
+    payoffs : np.array
+        A 3D numpy array of shape (number of games, rows, columns) with the payoff to player 1 of each pair of options in each game.
+    tolerance : float, optional
+        The tolerance used when checking that a candidate solution is an equilibrium, by default 1e-9.
+
+    Returns
+    -------
+    tuple
+        A tuple containing three numpy arrays; row_strats, column_strats and values.
+        row_strats : np.array
+            A 2D numpy array with the optimal mixed strategy of player 1 in each game.
+        column_strats : np.array
+            A 2D numpy array with the optimal mixed strategy of player 2 in each game.
+        values : np.array
+            The value of each game to player 1.
+
+    """
+    number_of_games, rows, columns = payoffs.shape
+    row_strats = np.zeros((number_of_games, rows))
+    column_strats = np.zeros((number_of_games, columns))
+    values = np.zeros(number_of_games)
+
+    row_minimums = payoffs.min(axis=2)
+    column_maximums = payoffs.max(axis=1)
+    maximin = row_minimums.max(axis=1)
+    solved = column_maximums.min(axis=1) - maximin <= tolerance
+    saddle_points = np.flatnonzero(solved)
+    row_strats[saddle_points, row_minimums[saddle_points].argmax(axis=1)] = 1
+    column_strats[saddle_points, column_maximums[saddle_points].argmin(axis=1)] = 1
+    values[saddle_points] = maximin[saddle_points]
+
+    for size in range(2, min(rows, columns) + 1):
+        right_hand_side = np.zeros(size + 1)
+        right_hand_side[size] = 1
+        for row_support in itertools.combinations(range(rows), size):
+            for column_support in itertools.combinations(range(columns), size):
+                unsolved = np.flatnonzero(~solved)
+                if len(unsolved) == 0:
+                    return row_strats, column_strats, values
+                submatrix = payoffs[unsolved][:, row_support][:, :, column_support]
+                row_system = np.zeros((len(unsolved), size + 1, size + 1))
+                row_system[:, :size, :size] = submatrix.transpose(0, 2, 1)
+                row_system[:, :size, size] = -1
+                row_system[:, size, :size] = 1
+                column_system = row_system.copy()
+                column_system[:, :size, :size] = submatrix
+                invertible = (np.abs(np.linalg.det(row_system)) > tolerance) & (np.abs(np.linalg.det(column_system)) > tolerance)
+                unsolved = unsolved[invertible]
+                if len(unsolved) == 0:
+                    continue
+                row_solution = np.linalg.solve(row_system[invertible], right_hand_side)
+                column_solution = np.linalg.solve(column_system[invertible], right_hand_side)
+                row_strat = np.zeros((len(unsolved), rows))
+                row_strat[:, row_support] = row_solution[:, :size]
+                column_strat = np.zeros((len(unsolved), columns))
+                column_strat[:, column_support] = column_solution[:, :size]
+                value = row_solution[:, size]
+                game_payoffs = payoffs[unsolved]
+                equilibrium = ((row_strat >= -tolerance).all(axis=1) & (column_strat >= -tolerance).all(axis=1)
+                               & (np.einsum("kij,kj->ki", game_payoffs, column_strat) <= value[:, None] + tolerance).all(axis=1)
+                               & (np.einsum("ki,kij->kj", row_strat, game_payoffs) >= value[:, None] - tolerance).all(axis=1))
+                found = unsolved[equilibrium]
+                row_strats[found] = np.clip(row_strat[equilibrium], 0, None)
+                column_strats[found] = np.clip(column_strat[equilibrium], 0, None)
+                values[found] = value[equilibrium]
+                solved[found] = True
+
+    for k in np.flatnonzero(~solved):
+        import nashpy as nash
+        row_strat, column_strat = nash.Game(payoffs[k]).linear_program()
+        row_strats[k] = np.clip(row_strat, 0, None)
+        column_strats[k] = np.clip(column_strat, 0, None)
+        values[k] = row_strats[k] @ payoffs[k] @ column_strats[k]
+    row_strats /= row_strats.sum(axis=1, keepdims=True)
+    column_strats /= column_strats.sum(axis=1, keepdims=True)
+    return row_strats, column_strats, values
+
+def backward_induction_solve(loss_bonuses=True, max_money=None, ruleset=accurate_ruleset):
+    """
+    Solves a whole accurate game by backward induction over every state of half, score, both players money and both players loss 
+    bonuses, giving the subgame perfect mixed strategy of player 1 in every state. As a round in the first half always has fewer than 
+    halftime points played and a round in the second half always has at least halftime, the score alone tells the two halves apart. As 
+    the game is symmetric, player 2 can use the same policy with the players swapped.
+
+    The ruleset must be a "first to" format with a halftime and no overtime, and its rewards, loss bonus ladder and starting money must 
+    be multiples of 0.5 so that money moves in steps of 0.5. Money below 1 is counted as 1.
+
+    Parameters
+    ----------
+    loss_bonuses : bool, optional
+        If True, players receive a loss bonus after losing a round, by default True.
+    max_money : int or float, optional
+        The maximum money a player can have, by default None which uses the max_money of the ruleset, 16 for accurate_ruleset.
+    ruleset : Ruleset, optional
+        The rules and format of the game, by default accurate_ruleset.
+
+    Returns
+    -------
+    tuple
+        A tuple containing two numpy arrays; values and policy.
+        values : np.array
+            An array of shape (play_to + 1, play_to + 1, money steps, money steps, bonus levels, bonus levels) with the chance of player 1 
+            winning from each state under optimal play, indexed by points1, points2, 2 * (money1 - 1), 2 * (money2 - 1), losses_bonus1 
+            and losses_bonus2. Rows and columns with play_to points hold the finished games.
+        policy : np.array
+            An array of shape (play_to, play_to, money steps, money steps, bonus levels, bonus levels, options) with the probability of 
+            player 1 picking each option, indexed the same way as values.
+
+    """
+    if ruleset.first_to_or_set_number != "first to" or ruleset.halftime is None or ruleset.overtime_half_length is not None:
+        raise ValueError("backward induction needs a first to format with a halftime and no overtime")
+    if loss_bonuses == False:
+        ruleset = without_loss_bonuses(ruleset)
+    if max_money is None:
+        max_money = ruleset.max_money
+    half_steps = 2 * np.array(list(ruleset.win_rewards) + list(ruleset.loss_rewards) + list(ruleset.loss_bonus_ladder) 
+                              + [ruleset.starting_money])
+    if np.any(half_steps != np.round(half_steps)):
+        raise ValueError("backward induction needs rewards, loss bonuses and starting money in steps of 0.5")
+    play_to = int(ruleset.play_to)
+    options = ruleset.options
+    number_of_options = options.shape[0]
+    # without loss bonuses both players stay on the first level of the ladder, so only that level is solved.
+    bonus_levels = len(ruleset.loss_bonus_ladder) if ruleset.loss_bonuses == True else 1
+    money_steps = int(2 * (max_money - 1)) + 1
+    start_index = int(2 * (ruleset.starting_money - 1))
+    win_steps = (2 * np.array(ruleset.win_rewards)).astype(int)
+    loss_steps = (2 * ruleset.loss_reward_table[:bonus_levels]).astype(int)
+    money1_index, money2_index, losses_bonus1, losses_bonus2 = np.ix_(range(money_steps), range(money_steps), range(bonus_levels), 
+                                                                      range(bonus_levels))
+    p1_win_bonuses = (np.maximum(losses_bonus1 - 1, 0), np.minimum(losses_bonus2 + 1, bonus_levels - 1))
+    p2_win_bonuses = (np.minimum(losses_bonus1 + 1, bonus_levels - 1), np.maximum(losses_bonus2 - 1, 0))
+    options1 = np.minimum((money1_index + 2) // 2, options.shape[0])
+    options2 = np.minimum((money2_index + 2) // 2, options.shape[1])
+
+    values = np.zeros((play_to + 1, play_to + 1, money_steps, money_steps, bonus_levels, bonus_levels))
+    values[play_to, :play_to] = 1
+    policy = np.zeros((play_to, play_to, money_steps, money_steps, bonus_levels, bonus_levels, number_of_options), dtype=np.float32)
+    for score_sum in range(2 * play_to - 2, -1, -1):
+        points1 = np.array([i for i in range(0, play_to) if 0 <= score_sum - i <= play_to - 1])
+        points2 = score_sum - points1
+        points1_index = points1[:, None, None, None, None]
+        points2_index = points2[:, None, None, None, None]
+        payoffs = np.zeros((len(points1), money_steps, money_steps, bonus_levels, bonus_levels, number_of_options, options.shape[1]))
+        for i in range(0, number_of_options):
+            for j in range(0, options.shape[1]):
+                if score_sum == ruleset.halftime - 1:
+                    # after the last round of the first half both players go back to the starting money and no loss bonus.
+                    value_if_p1_wins = values[points1_index + 1, points2_index, start_index, start_index, 0, 0]
+                    value_if_p2_wins = values[points1_index, points2_index + 1, start_index, start_index, 0, 0]
+                else:
+                    value_if_p1_wins = values[points1_index + 1, points2_index, np.minimum(money1_index + win_steps[i], money_steps - 1), 
+                                              np.clip(money2_index + loss_steps[losses_bonus2, j], 0, money_steps - 1), *p1_win_bonuses]
+                    value_if_p2_wins = values[points1_index, points2_index + 1, 
+                                              np.clip(money1_index + loss_steps[losses_bonus1, i], 0, money_steps - 1), 
+                                              np.minimum(money2_index + win_steps[j], money_steps - 1), *p2_win_bonuses]
+                payoffs[..., i, j] = options[i][j] * value_if_p1_wins + (1 - options[i][j]) * value_if_p2_wins
+                # options a player can't afford are made strictly worse than any option they can afford.
+                payoffs[..., i, j] = np.where(j >= options2, 2, payoffs[..., i, j])
+                payoffs[..., i, j] = np.where(i >= options1, -1, payoffs[..., i, j])
+        row_strats, column_strats, game_values = batch_solve_zero_sum_games(payoffs.reshape((-1,) + options.shape))
+        values[points1, points2] = game_values.reshape(payoffs.shape[:5])
+        policy[points1, points2] = row_strats.reshape(payoffs.shape[:5] + (number_of_options,))
+    return values, policy
+
+backward_induction_policy_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backward_induction_policy.npz")
+backward_induction_policy = None
+
+def compact_backward_induction_policy(policy):
+    """
+    Turns a policy from backward_induction_solve into a compact lookup table. Almost every state has a pure optimal strategy, so each 
+    state only keeps the index of the option it picks, and the few mixed states keep a row in a separate table of mixed strategies.
+
+    Parameters
+    ----------
+    policy : np.array
+        The policy array from backward_induction_solve.
+
+    Returns
+    -------
+    tuple
+        A tuple containing two numpy arrays; policy_index and mixed_strats.
+        policy_index : np.array
+            An array of the same shape as policy without its last axis. It holds the option picked in a pure state, or -(k + 1) for a 
+            state which plays row k of mixed_strats. Its dtype is int16 unless there are too many mixed states for it.
+        mixed_strats : np.array
+            A 2D numpy array with the mixed strategy of each mixed state.
+
+    """
+    pure = policy.max(axis=-1) == 1
+    mixed_states = np.flatnonzero(~pure)
+    dtype = np.int16 if len(mixed_states) < np.iinfo(np.int16).max else np.int32
+    policy_index = policy.argmax(axis=-1).astype(dtype)
+    policy_index.reshape(-1)[mixed_states] = -1 - np.arange(len(mixed_states), dtype=dtype)
+    mixed_strats = policy.reshape(-1, policy.shape[-1])[mixed_states]
+    return policy_index, mixed_strats
+
+def save_backward_induction_policy(policy, path=backward_induction_policy_path):
+    """
+    Saves a policy from backward_induction_solve to a compressed numpy file as the compact lookup table from 
+    compact_backward_induction_policy.
+
+    Parameters
+    ----------
+    policy : np.array
+        The policy array from backward_induction_solve.
+    path : str, optional
+        The file to save the policy to, by default backward_induction_policy_path.
+
+    Returns
+    -------
+    None.
+
+    """
+    policy_index, mixed_strats = compact_backward_induction_policy(policy)
+    np.savez_compressed(path, policy_index=policy_index, mixed_strats=mixed_strats)
+
+def load_backward_induction_policy(path=backward_induction_policy_path):
+    """
+    Loads a policy saved by save_backward_induction_policy and makes it the policy that backward_induction_strat plays.
+
+    Parameters
+    ----------
+    path : str, optional
+        The file the policy is stored in, by default backward_induction_policy_path.
+
+    Returns
+    -------
+    tuple
+        The policy_index and mixed_strats arrays from compact_backward_induction_policy.
+
+    """
+    global backward_induction_policy
+    with np.load(path) as stored:
+        policy_index, mixed_strats = stored["policy_index"], stored["mixed_strats"]
+    policy_index.flags.writeable = False
+    mixed_strats.flags.writeable = False
+    backward_induction_policy = (policy_index, mixed_strats)
+    return backward_induction_policy
+
+def solve_backward_induction_policy(path=backward_induction_policy_path):
+    """
+    Solves the accurate game with backward_induction_solve, which takes about 10 seconds, saves the policy to path and makes it the policy 
+    that backward_induction_strat plays. Only needs to be run once, or again after the rules are changed.
+
+    Parameters
+    ----------
+    path : str, optional
+        The file to save the policy to, by default backward_induction_policy_path.
+
+    Returns
+    -------
+    tuple
+        The policy_index and mixed_strats arrays from compact_backward_induction_policy.
+
+    """
+    save_backward_induction_policy(backward_induction_solve()[1], path)
+    return load_backward_induction_policy(path)
+
+def get_backward_induction_policy(path=backward_induction_policy_path):
+    """
+    Returns the policy that backward_induction_strat plays, loading it from path the first time it is needed. If the file does not exist 
+    a warning is given and the accurate game is solved in memory, which takes about 10 seconds and is not saved; run 
+    solve_backward_induction_policy once to save it.
+
+    Parameters
+    ----------
+    path : str, optional
+        The file the policy is stored in, by default backward_induction_policy_path.
+
+    Returns
+    -------
+    tuple
+        The policy_index and mixed_strats arrays from compact_backward_induction_policy.
+
+    """
+    global backward_induction_policy
+    if backward_induction_policy is None:
+        if os.path.exists(path):
+            load_backward_induction_policy(path)
+        else:
+            warnings.warn("No backward induction policy at " + path + ", solving the accurate game in memory, which takes about 10 "
+                          "seconds. Run solve_backward_induction_policy() once to save it.")
+            policy_index, mixed_strats = compact_backward_induction_policy(backward_induction_solve()[1])
+            policy_index.flags.writeable = False
+            mixed_strats.flags.writeable = False
+            backward_induction_policy = (policy_index, mixed_strats)
+    return backward_induction_policy
+
+# Compiled strategies:
+
+def compile_strategy(player_strat, n=5, rounds=25, max_money=16):
+    """
+    Evaluates a strategy once over its whole discrete input domain of player, first or second half, round number, both players money in 
+    steps of 0.5 and both players loss bonuses, and stores its option probabilities in a dense table. Strategies which need the score 
+    can not be compiled. A strategy with a batch version is evaluated with it four calls at a time, which takes well under a second, 
+    while any other strategy is called once per state, which takes several seconds. The default table is about 38 MB.
+
+    The table only covers round numbers below rounds. Round numbers from rounds on are played with the choices of the last round in the 
+    table, which is exact for strategies that do not tell those rounds apart, such as every built in strategy with the default rounds. 
+    The round numbers given to strategies start again at each half and overtime half, so the default of 25 covers a first to 13 game and 
+    an accurate game with or without overtime, while a longer "set number" game needs a larger rounds.
+
+    Parameters
+    ----------
+    player_strat : function
+        The strategy function being compiled.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, fixed for the whole table, by default 5.
+    rounds : int, optional
+        The number of round numbers in the table, by default 25 which covers a first to 13 game.
+    max_money : int or float, optional
+        The maximum money a player can have, by default 16.
+
+    Returns
+    -------
+    np.array
+        An array of shape (2, 2, rounds, money steps, money steps, 5, 5, 4) with the probability of picking each option, padded with zeros, 
+        indexed by player0_or_1, first_half, round_number, 2 * (eco - 1), 2 * (op_eco - 1), losses_bonus1 and losses_bonus2.
+
+    """
+    if getattr(player_strat, "needs_points", False):
+        raise ValueError(player_strat.__name__ + " depends on the score so it can not be compiled into a table")
+    money_steps = int(2 * (max_money - 1)) + 1
+    table = np.zeros((2, 2, rounds, money_steps, money_steps, 5, 5, 4), dtype=np.float32)
+    money_values = [1 + 0.5 * i for i in range(money_steps)]
+    batch_strat = getattr(player_strat, "batch_strategy", None)
+    if batch_strat is not None:
+        grids = np.meshgrid(np.arange(rounds), money_values, money_values, range(5), range(5), indexing="ij")
+        round_numbers, ecos, op_ecos, losses_bonus1, losses_bonus2 = [grid.reshape(-1) for grid in grids]
+        for player0_or_1 in range(0, 2):
+            for first_half in range(0, 2):
+                probabilities = batch_strat(round_numbers, ecos, op_ecos, player0_or_1, n, losses_bonus1, losses_bonus2, 
+                                            bool(first_half))
+                table[player0_or_1, first_half] = probabilities.reshape(table.shape[2:])
+        table.flags.writeable = False
+        return table
+    for player0_or_1 in range(0, 2):
+        for first_half in range(0, 2):
+            for round_number in range(0, rounds):
+                for eco_index, eco in enumerate(money_values):
+                    for op_eco_index, op_eco in enumerate(money_values):
+                        if player0_or_1 == 0:
+                            game_matrix = gen_opts(eco, op_eco)
+                        else:
+                            game_matrix = gen_opts(op_eco, eco)
+                        for losses_bonus1 in range(0, 5):
+                            for losses_bonus2 in range(0, 5):
+                                strat = player_strat(round_number, eco, op_eco, game_matrix, player0_or_1, n, losses_bonus1, 
+                                                     losses_bonus2, first_half=bool(first_half))
+                                table[player0_or_1, first_half, round_number, eco_index, op_eco_index, losses_bonus1, 
+                                      losses_bonus2, :len(strat)] = strat
+    table.flags.writeable = False
+    return table
+
+def table_strategy(strategy_table, round_number, eco, op_eco, game_matrix, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, 
+                   first_half=False):
+    """
+    A strategy which looks its choice up in a table from compile_strategy. Used through compiled_strategy, which fixes strategy_table.
+    """
+    strat = strategy_table[player0_or_1, int(first_half), min(round_number, strategy_table.shape[2] - 1), 
+                           min(int(2 * eco) - 2, strategy_table.shape[3] - 1), min(int(2 * op_eco) - 2, strategy_table.shape[4] - 1), 
+                           losses_bonus1, losses_bonus2]
+    return strat[:min(int(eco), 4)].tolist()
+
+def compiled_strategy(player_strat, n=5, rounds=25, max_money=16):
+    """
+    Compiles a strategy with compile_strategy and returns a new strategy function which plays it by table lookup. The batch engine indexes 
+    the table of the returned strategy directly instead of calling it. Round numbers from rounds on use the last round in the table, as 
+    described in compile_strategy.
+
+    Parameters
+    ----------
+    player_strat : function
+        The strategy function being compiled.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, fixed for the compiled strategy, by default 5.
+    rounds : int, optional
+        The number of round numbers in the table, by default 25 which covers a first to 13 game.
+    max_money : int or float, optional
+        The maximum money a player can have, by default 16.
+
+    Returns
+    -------
+    functools.partial
+        A strategy function with the usual arguments and the attributes stratname, __name__ and strategy_table.
+
+    """
+    strategy_table = compile_strategy(player_strat, n=n, rounds=rounds, max_money=max_money)
+    strat = functools.partial(table_strategy, strategy_table)
+    # strategies compiled from their batch version have never been called, so stratname may not be set yet.
+    strat.stratname = getattr(player_strat, "stratname", player_strat.__name__)
+    strat.__name__ = player_strat.__name__
+    strat.strategy_table = strategy_table
+    return strat
+
+def table_strategy_probabilities(strategy_table, round_number, money, losses_bonus, player0_or_1, first_half=False):
+    """
+    Looks up the option probabilities of a compiled strategy for every match in a batch at once.
+
+    Parameters
+    ----------
+    strategy_table : np.array
+        A table from compile_strategy.
+    round_number : int
+        The current round number, shared by every match in the batch.
+    money : np.array
+        A 2D numpy array with the money of player 1 and player 2 in each match.
+    losses_bonus : np.array
+        A 2D numpy array with the loss bonus of player 1 and player 2 in each match.
+    player0_or_1 : int
+        0 if the strategy plays as player 1, 1 if it plays as player 2.
+    first_half : bool, optional
+        Whether the rounds are being played in the first half of an accurate game, by default False.
+
+    Returns
+    -------
+    tuple
+        A tuple containing two numpy arrays; probabilities and number_of_options.
+        probabilities : np.array
+            A 2D numpy array of shape (number of matches, 4) with the probability of picking each option.
+        number_of_options : np.array
+            The number of options the strategy can pick from in each match.
+
+    """
+    money_index = np.minimum((2 * money).astype(int) - 2, strategy_table.shape[3] - 1)
+    probabilities = strategy_table[player0_or_1, int(first_half), min(round_number, strategy_table.shape[2] - 1), money_index[:, player0_or_1], 
+                                   money_index[:, 1 - player0_or_1], losses_bonus[:, 0], losses_bonus[:, 1]]
+    return probabilities, np.minimum(money[:, player0_or_1].astype(int), 4)
+
+def unpack_points_over_time_and_money_over_time(game_outcome, money_outcome):
+    """
+    A function to take game_outcome and money_outcome and from that return each teams scores and money at all rounds.
+
+    Parameters
+    ----------
+    game_outcome : list
+        A list of lists, where each inner list contains the points of player 1 and player 2 at each round.
+    money_outcome : list
+        A list of lists, where each inner list contains the money of player 1 and player 2 at each round.
+    
+    Returns
+    -------
+    tuple
+        A tuple containing four lists; team1score, team2score, team1money and team2money.
+        team1score : list
+            A list of the scores over rounds of player 1.
+        team2score : list
+            A list of the scores over rounds of player 2.
+        team1money : list
+            A list of the money over rounds of player 1.
+        team2money : list
+            A list of the money over rounds of player 2.
+
+    """
+    team1score=[]
+    team2score=[]
+    team1money=[]
+    team2money=[]
+    for i in game_outcome:
+        team1score.append(i[0])
+        team2score.append(i[1])
+
+    for i in money_outcome:
+        team1money.append(i[0])
+        team2money.append(i[1])
+    return team1score, team2score, team1money, team2money
+
+def graph_it_out(team1score, team2score, team1money, team2money, strat1, strat2, first_to=13, max_money=15):
+    """
+    A function to graph out a comparison of money and points for each team from the given lists.
+
+    Parameters
+    ----------
+    team1score : list
+        A list of the scores over rounds of player 1.
+    team2score : list
+        A list of the scores over rounds of player 2.
+    team1money : list
+        A list of the money over rounds of player 1.
+    team2money : list
+        A list of the money over rounds of player 2.
+    strat1 : function
+        The strategy function for player 1.
+    strat2 : function
+        The strategy function for player 2.
+    first_to : int or float, optional
+        The number of round wins a player needs to win the game, by default 13.
+    max_money : int or float, optional
+        The maximum amount of money that a player can have at any given round, by default 15.
+
+    Returns
+    -------
+    None. 
+        Displays the graph to compare the points over time and money over time for each team.
+
+    """
+    import matplotlib.pyplot as plt
+    fig, (ax1, ax2) = plt.subplots(2, figsize = (16, 8.1))
+    ax_2a = ax1.twinx()
+    ax_2b = ax2.twinx()
+    ax1.set_title("Team 1: " + strat1.stratname)
+    ax2.set_title("Team 2: " + strat2.stratname)
+    ax1.set_ylabel("wins")
+    ax2.set_xlabel("round")
+    ax2.set_ylabel("wins")
+    ax_2a.set_ylabel("eco")
+    ax_2b.set_ylabel("eco")
+    ax1.step(range(0,len(team1score)),team1score, linewidth=5)
+    ax2.step(range(0,len(team2score)),team2score, linewidth=5,color="red")
+    ax_2a.step(range(0,len(team1score)), team1money, linewidth=2.5,color="green")
+    ax_2b.step(range(0,len(team2score)), team2money, linewidth=2.5,color="forestgreen")
+    ax1.set(ylim=(0, first_to))
+    ax2.set(ylim=(0, first_to))
+    ax_2a.set(ylim=(1, max_money))
+    ax_2b.set(ylim=(1, max_money))
+
+    plt.show()
+
+def find_possible_strategies(play_to=13, repetitions=10_000, accurate_game=False, n=5):
+    """
+    A function to use the random strategy repeatedly to find what the possible strategies are in a full normal game.
+    
+    Parameters
+    ----------
+    play_to : int or float, optional
+        The required number of round wins for a player to win a game, by default 13.
+    repetitions : int, optional
+        number of games to be tried to find possible strategies, by default 10,000.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+
+    Returns
+    -------
+    int
+        The length of the list of all found strategies.
+
+    """
+    strat1 = random_strat
+    strat2 = random_strat
+    possible_strategies = []
+    for i in range(repetitions):
+        print(str(100 * i / repetitions) + " percent complete")
+        if accurate_game == False:
+            current_points_over_time, current_money_over_time = two_player_game(player1_strat=strat1, player2_strat=strat2, max_money=16, 
+                                                                                first_to_or_set_number="first to", play_to=play_to, 
+                                                                                loss_bonuses=True, n=n)
+            if two_player_game.player1choices not in possible_strategies:
+                possible_strategies.append(two_player_game.player1choices)
+            if two_player_game.player2choices not in possible_strategies:
+                possible_strategies.append(two_player_game.player2choices)
+        else:
+            current_points_over_time, current_money_over_time = accurate_cs_game(strat1=strat1, strat2=strat2, n=n, loss_bonuses=True)
+            if accurate_cs_game.player1choices not in possible_strategies:
+                possible_strategies.append(accurate_cs_game.player1chocies)
+            if accurate_cs_game.player2choices not in possible_strategies:
+                possible_strategies.append(accurate_cs_game.player2chocies)
+    return len(possible_strategies)
+
+def play_m_games(strat1, strat2, n=5, m=100, play_to=13, accurate_game=False, batch=False, rng=None, common_random_numbers=False, 
+                 ruleset=None):
+    """
+    A function to play m full games of two given strategies against each other.
+
+    Parameters
+    ----------
+    strat1 : function
+        The strategy function for player 1.
+    strat2 : function
+        The strategy function for player 2.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+    m : int, optional
+        The number of games played between the strategies, by default 100.
+    play_to : int or float, optional
+        The required number of round wins for a player to win a game, by default 13.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False
+    batch : bool, optional
+        If True, all m games are played at once with the batch engine instead of one at a time, by default False.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator that every game draws its random values from, by default None.
+    common_random_numbers : bool, optional
+        If True, each game gets its own random stream which only depends on rng and the game's index, so that calls with the same seed play 
+        every game on the same random values whatever the strategies or n. Useful for comparing configurations with less noise, 
+        by default False.
+    ruleset : Ruleset, optional
+        The ruleset the games are played with. Accurate games are played in its format, while first to play_to games use its game matrix, 
+        rewards, loss bonus ladder and money but no halftime or overtime. If None, accurate_ruleset or default_ruleset is used, by default 
+        None.
+
+    Returns
+    -------
+    list
+        A list of the two players final scores after the m games.
+
+    """
+    if profile_stats is not None:
+        start = time.perf_counter()
+    if ruleset is None:
+        ruleset = accurate_ruleset if accurate_game == True else default_ruleset
+    if accurate_game == False:
+        ruleset = ruleset._replace(first_to_or_set_number="first to", play_to=play_to, halftime=None, overtime_half_length=None)
+    if rng is not None or common_random_numbers == True:
+        rng = np.random.default_rng(rng)
+    if batch == True:
+        if accurate_game == False:
+            gamescores = batch_two_player_game(player1_strat=strat1, player2_strat=strat2, m=m, n=n, play_to=play_to, rng=rng, 
+                                               common_random_numbers=common_random_numbers, ruleset=ruleset)[0]
+        else:
+            gamescores = batch_accurate_cs_game(strat1=strat1, strat2=strat2, m=m, n=n, loss_bonuses=True, rng=rng, 
+                                                common_random_numbers=common_random_numbers, ruleset=ruleset)[0]
+        player2_wins = int(np.sum(gamescores[:, 1] > gamescores[:, 0]))
+        scores = [m - player2_wins, player2_wins]
+    else:
+        scores = [0, 0]
+        game_rng = rng
+        if common_random_numbers == True:
+            game_seeds = rng.integers(0, 2 ** 63, size=m).tolist()
+        for i in range(0, m):
+            if common_random_numbers == True:
+                game_rng = game_seeds[i]
+            if accurate_game == False:
+                gamescore = two_player_game(player1_strat=strat1, player2_strat=strat2, n=n, play_to=play_to, rng=game_rng, 
+                                            history="final", ruleset=ruleset)[0]
+                winner = gamescore.index(max(gamescore))
+            else:
+                gamescore = accurate_cs_game(strat1=strat1, strat2=strat2, n=n, loss_bonuses=True, rng=game_rng, history="final", 
+                                             ruleset=ruleset)[0]
+                winner = gamescore.index(max(gamescore))
+            scores[winner] += 1
+    if profile_stats is not None:
+        # the calls of a pair are the number of games.
+        record_profile("pair", strat1.__name__ + " vs " + strat2.__name__, time.perf_counter() - start, calls=m)
+    return scores
+
+def compare_save_first_n_with_other_strategies_for_different_n(save_first_n_selection=save_first_n_rounds, other_strategy=short_term, 
+                                                               play_to=13, number_of_games=1_000, accurate_game=False, batch=False, 
+                                                               rng=None, common_random_numbers=False):
+    """
+    A function to return winrates of save first n against another strategy for varying values of n, from 0 to the play_to value.
+
+    Parameters
+    ----------
+    save_first_n_selection : function, optional
+        The chosen strategy which depends on n, such as save_first_n_rounds_then_lil_then_short_term, by default save_first_n_rounds.
+    other_strategy : function, optional
+        The chosen strategy to play against the save_first_n_selection strategy, by default short_term.
+    play_to : int or float, optional
+        The required number of round wins for a player to win a game, by default 13.
+    number_of_games : int, optional
+        The given number of games for the player 1 strategy to play against player 2 strategy, by default 1,000.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False
+    batch : bool, optional
+        If True, the games for each n are played at once with the batch engine, by default False.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator for the games, by default None.
+    common_random_numbers : bool, optional
+        If True, every value of n is played on the same random values, so that the differences between values of n are much less noisy,
+        by default False.
+    
+    Returns
+    -------
+    tuple
+        A tuple containing two lists; save_first_n_winrates and other_strategy_winrates.
+        save_first_n_winrates : list
+            A list of the win rates for save_first_n strategy for values of n from 0 to play_to.
+        other_strategy_winrates : list
+            A list of the win rates for the other strategy for values of n from 0 to play_to.
+
+    """
+    save_first_first_n_winrates = []
+    other_strategy_winrates = []
+    if rng is not None or common_random_numbers == True:
+        rng = np.random.default_rng(rng)
+    if common_random_numbers == True:
+        common_seed = int(rng.integers(0, 2 ** 63))
+    for n in range(0, play_to):
+        if common_random_numbers == True:
+            rng = common_seed
+        save_first_first_n_wins, other_strategy_wins = play_m_games(strat1=save_first_n_selection, strat2=other_strategy, n=n, 
+                                                                    m=number_of_games, play_to=play_to, accurate_game=accurate_game, 
+                                                                    batch=batch, rng=rng, common_random_numbers=common_random_numbers)
+        save_first_first_n_winrate = save_first_first_n_wins / number_of_games
+        other_strategy_winrate = other_strategy_wins / number_of_games
+        save_first_first_n_winrates.append(save_first_first_n_winrate)
+        other_strategy_winrates.append(other_strategy_winrate)
+    return save_first_first_n_winrates, other_strategy_winrates
+
+def graph_save_first_n_against_other_strategy(save_first_n_selection=save_first_n_rounds, other_strategy=short_term, play_to=13, 
+                                              number_of_games=1_000, accurate_game=False, batch=False, rng=None, 
+                                              common_random_numbers=False):
+    """
+    A function to show interactions on a graph between save first n against another strategy depending on the value of n.
+
+    Parameters
+    ----------
+    save_first_n_selection : function, optional
+        The chosen strategy which depends on n, such as save_first_n_rounds_then_lil_then_short_term, by default save_first_n_rounds.
+    other_strategy : function, optional
+        The chosen strategy to play against the save_first_n_selection strategy, by default short_term.
+    play_to : int or float, optional
+        The required number of round wins for a player to win a game, by default 13.
+    number_of_games : int, optional
+        The given number of games for the player 1 strategy to play against player 2 strategy, by default 1,000.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False
+    batch : bool, optional
+        If True, the games for each n are played at once with the batch engine, by default False.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator for the games, by default None.
+    common_random_numbers : bool, optional
+        If True, every value of n is played on the same random values, by default False.
+    
+    Returns
+    -------
+    None.
+        Displays the graph comparing win rates for different values of n.
+
+    """
+    save_first_n_winrates = compare_save_first_n_with_other_strategies_for_different_n(save_first_n_selection=save_first_n_selection, 
+                                                                                       other_strategy=other_strategy, play_to=play_to, 
+                                                                                       number_of_games=number_of_games, 
+                                                                                       accurate_game=accurate_game, batch=batch, rng=rng, 
+                                                                                       common_random_numbers=common_random_numbers)[0]
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    ax.set_title(save_first_n_selection.stratname + " vs " + other_strategy.stratname)
+    ax.set_ylabel("winrate")
+    ax.set_xlabel("n")
+    ax.set(ylim=(0, 1))
+    ax.set(xlim=(0, play_to))
+    plt.plot(save_first_n_winrates, 'r-x')
+
+    plt.show()
+
+def wilson_interval_half_width(wins, games, confidence=0.95):
+    """
+    Finds the half width of the Wilson score confidence interval for a win rate.
+
+    Parameters
+    ----------
+    wins : int
+        The number of games won.
+    games : int
+        The number of games played.
+    confidence : float, optional
+        The confidence level of the interval, by default 0.95.
+
+    Returns
+    -------
+    float
+        The half width of the confidence interval.
+
+    """
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    winrate = wins / games
+    return z / (1 + z ** 2 / games) * np.sqrt(winrate * (1 - winrate) / games + z ** 2 / (4 * games ** 2))
+
+def play_games_until_confident(strat1, strat2, n=5, max_games=10_000, batch_size=500, target_half_width=0.01, confidence=0.95, 
+                               accurate_game=False, batch=False, rng=None, ruleset=None):
+    """
+    Plays games between two strategies in batches of batch_size until the confidence interval of player 1's win rate is narrower than 
+    target_half_width either side, or max_games have been played.
+
+    Parameters
+    ----------
+    strat1 : function
+        The strategy function for player 1.
+    strat2 : function
+        The strategy function for player 2.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+    max_games : int, optional
+        The most games that will be played, by default 10,000.
+    batch_size : int, optional
+        The number of games played between each check of the confidence interval, by default 500.
+    target_half_width : float, optional
+        The half width of the confidence interval at which to stop, by default 0.01.
+    confidence : float, optional
+        The confidence level of the interval, by default 0.95.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False.
+    batch : bool, optional
+        If True, each batch of games is played at once with the batch engine, by default False.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator that every game draws its random values from, by default None.
+    ruleset : Ruleset, optional
+        The ruleset the games are played with, as in play_m_games, by default None.
+
+    Returns
+    -------
+    list
+        A list of the two players final scores after all of the games played.
+
+    """
+    if rng is not None:
+        rng = np.random.default_rng(rng)
+    scores = [0, 0]
+    while scores[0] + scores[1] < max_games:
+        results = play_m_games(strat1=strat1, strat2=strat2, n=n, m=min(batch_size, max_games - scores[0] - scores[1]), 
+                               accurate_game=accurate_game, batch=batch, rng=rng, ruleset=ruleset)
+        scores[0] += results[0]
+        scores[1] += results[1]
+        if wilson_interval_half_width(scores[0], scores[0] + scores[1], confidence) < target_half_width:
+            break
+    return scores
+
+def fixed_n_strategy(player_strat, fixed_n, round_number, eco, op_eco, game_matrix, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, 
+                     first_half=False, **kwargs):
+    """
+    A strategy which plays player_strat with its own fixed_n instead of the n given by the game. Used through with_n.
+    """
+    return player_strat(round_number, eco, op_eco, game_matrix, player0_or_1, fixed_n, losses_bonus1, losses_bonus2, first_half=first_half, 
+                        **kwargs)
+
+def fixed_n_batch_strategy(batch_strat, fixed_n, round_number, eco, op_eco, player0_or_1=0, n=0, losses_bonus1=0, losses_bonus2=0, 
+                           first_half=False, **kwargs):
+    """
+    A batch strategy which plays batch_strat with its own fixed_n instead of the n given by the game. Used through with_n.
+    """
+    return batch_strat(round_number, eco, op_eco, player0_or_1, fixed_n, losses_bonus1, losses_bonus2, first_half, **kwargs)
+
+def with_n(player_strat, n):
+    """
+    Returns a version of a strategy which always uses the given n, so that the two players in a game can have different values of n.
+
+    Parameters
+    ----------
+    player_strat : function
+        The strategy function.
+    n : int
+        The value of n the strategy always uses.
+
+    Returns
+    -------
+    functools.partial
+        A strategy function with the usual arguments and the attributes stratname, __name__, needs_points and, if player_strat has one, 
+        batch_strategy.
+
+    """
+    strat = functools.partial(fixed_n_strategy, player_strat, n)
+    strat.__name__ = player_strat.__name__ + "_n" + str(n)
+    strat.stratname = getattr(player_strat, "stratname", player_strat.__name__) + " (n=" + str(n) + ")"
+    strat.needs_points = getattr(player_strat, "needs_points", False)
+    if hasattr(player_strat, "batch_strategy"):
+        strat.batch_strategy = functools.partial(fixed_n_batch_strategy, player_strat.batch_strategy, n)
+    return strat
+
+def parameter_sweep(strategies, n_values, opponents, opponent_n_values, m=1_000, accurate_game=False, batch=True, processes=None, rng=None, 
+                    common_random_numbers=False):
+    """
+    Plays every (strategy, n) in a grid against every (opponent, n) in a second grid and returns the win rates as an array that can be 
+    sliced, so a family of strategies such as save_first_n_rounds and save_til_n_eco can be tuned against a whole field in one go.
+
+    Parameters
+    ----------
+    strategies : list
+        A list of the strategy functions being tuned, played as player 1.
+    n_values : list
+        The values of n tried for the strategies.
+    opponents : list
+        A list of the opponent strategy functions, played as player 2.
+    opponent_n_values : list
+        The values of n tried for the opponents.
+    m : int, optional
+        The number of games played for each cell, by default 1,000.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False.
+    batch : bool, optional
+        If True, the games of each cell are played at once with the batch engine, by default True.
+    processes : int, optional
+        If given, the cells are split across this many worker processes, by default None.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator for the games, by default None.
+    common_random_numbers : bool, optional
+        If True, every cell is played on the same random values, so that differences between cells are less noisy, by default False.
+
+    Returns
+    -------
+    np.array
+        An array of shape (len(strategies), len(n_values), len(opponents), len(opponent_n_values)) with the win rate of each strategy and 
+        n against each opponent and n.
+
+    """
+    rng = np.random.default_rng(rng)
+    cells = list(itertools.product(range(len(strategies)), range(len(n_values)), range(len(opponents)), range(len(opponent_n_values))))
+    if common_random_numbers == True:
+        cell_rngs = [int(rng.integers(0, 2 ** 63))] * len(cells)
+    else:
+        cell_rngs = rng.spawn(len(cells))
+    winrates = np.zeros((len(strategies), len(n_values), len(opponents), len(opponent_n_values)))
+    if processes is not None:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(play_m_games, strat1=with_n(strategies[i], n_values[k]), 
+                                       strat2=with_n(opponents[j], opponent_n_values[l]), m=m, accurate_game=accurate_game, batch=batch, 
+                                       rng=cell_rng, common_random_numbers=common_random_numbers) 
+                       for (i, k, j, l), cell_rng in zip(cells, cell_rngs)]
+            for (i, k, j, l), future in zip(cells, futures):
+                winrates[i, k, j, l] = future.result()[0] / m
+        return winrates
+    for (i, k, j, l), cell_rng in zip(cells, cell_rngs):
+        results = play_m_games(strat1=with_n(strategies[i], n_values[k]), strat2=with_n(opponents[j], opponent_n_values[l]), m=m, 
+                               accurate_game=accurate_game, batch=batch, rng=cell_rng, common_random_numbers=common_random_numbers)
+        winrates[i, k, j, l] = results[0] / m
+    return winrates
+
+def generate_interaction_matrix(strategies, n=5, sample_size=1_000, decimal_places=3, accurate_game=False, batch=False, processes=None,
+                                shards_per_pair=1, rng=None, common_random_numbers=False, ruleset=None):
+    """
+    Given a list of strategies this function plays sample_size number of games of each strategy against each other strategy to generate a 
+    matrix which has the win rate of each strategy against each other. 
+    
+    Parameters
+    ----------
+    strategies : list
+        A list of functions which are the strategies for our interaction matrix.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+    sample_size : int, optional
+        A chosen number of games to simulate play to find win rates, by default 1,000.
+    decimal_places : int, optional
+        The chosen number of decimal places that the interaction matrix will return with, by default 3.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False
+    batch : bool, optional
+        If True, the games for each pair of strategies are played at once with the batch engine, by default False.
+    processes : int, optional
+        If given, the pairs of strategies are split across this many worker processes instead of being played one after another,
+        by default None.
+    shards_per_pair : int, optional
+        The number of pieces the sample_size games of each pair are split into when using worker processes, by default 1.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator for the games. When using worker processes every shard is given its own independent generator spawned 
+        from it, by default None.
+    common_random_numbers : bool, optional
+        If True, every pair of strategies is played on the same random values, so that differences between cells are less noisy. Can not 
+        be used with worker processes, by default False.
+    ruleset : Ruleset, optional
+        The ruleset the games are played with, as in play_m_games. Rulesets can be sent to worker processes, by default None.
+    
+    Returns
+    -------
+    list
+        A list of lists representing our interaction matrix, can be put into a numpy array.
+
+    """
+    if processes is not None and common_random_numbers == True:
+        raise ValueError("common random numbers can not be used with worker processes")
+    interaction_matrix = [[0 for i in range(len(strategies))] for j in range(len(strategies))]
+    if rng is not None:
+        rng = np.random.default_rng(rng)
+    if processes is not None:
+        pairs = [(i, j) for i in range(0, len(strategies)) for j in range(i + 1, len(strategies))]
+        shard_sizes = [sample_size // shards_per_pair + (1 if k < sample_size % shards_per_pair else 0) for k in range(shards_per_pair)]
+        shard_rngs = np.random.default_rng(rng).spawn(len(pairs) * shards_per_pair)
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = []
+            for pair_index, (i, j) in enumerate(pairs):
+                for k in range(shards_per_pair):
+                    futures.append(executor.submit(play_m_games, strat1=strategies[i], strat2=strategies[j], n=n, m=shard_sizes[k],
+                                                   accurate_game=accurate_game, batch=batch,
+                                                   rng=shard_rngs[pair_index * shards_per_pair + k], ruleset=ruleset))
+            for pair_index, (i, j) in enumerate(pairs):
+                results = [0, 0]
+                for future in futures[pair_index * shards_per_pair:(pair_index + 1) * shards_per_pair]:
+                    shard_results = future.result()
+                    results[0] += shard_results[0]
+                    results[1] += shard_results[1]
+                print("i: " + strategies[i].__name__, "j: " + strategies[j].__name__)
+                interaction_matrix[i][j] = round(results[0] * (1 / sample_size), decimal_places)
+                interaction_matrix[j][i] = round(results[1] * (1 / sample_size), decimal_places)
+        for i in range(0, len(strategies)):
+            interaction_matrix[i][i] = 0.5
+        return interaction_matrix
+
+    if common_random_numbers == True:
+        common_seed = int(np.random.default_rng(rng).integers(0, 2 ** 63))
+    for i in range(0, len(strategies)):
+        for j in range(i, len(strategies)):
+            print("i: " + strategies[i].__name__, "j: " + strategies[j].__name__)
+            if i == j:
+                interaction_matrix[i][i] = 0.5
+            else:
+                if common_random_numbers == True:
+                    rng = common_seed
+                results = play_m_games(strat1=strategies[i], strat2=strategies[j], n=n, m=sample_size, accurate_game=accurate_game,
+                                       batch=batch, rng=rng, common_random_numbers=common_random_numbers, ruleset=ruleset)
+                interaction_matrix[i][j] = round(results[0] * (1 / sample_size), decimal_places)
+                interaction_matrix[j][i] = round(results[1] * (1 / sample_size), decimal_places)
+
+    return interaction_matrix
+            
+def generate_interaction_matrix_adaptive(strategies, n=5, max_games=10_000, decimal_places=3, accurate_game=False, batch=False, rng=None, 
+                                         batch_size=500, target_half_width=0.01, confidence=0.95, ruleset=None):
+    """
+    Generates an interaction matrix like generate_interaction_matrix, but each pair plays games in batches of batch_size until the 
+    confidence interval of its win rate is narrower than target_half_width either side, so that more games go to closely matched pairs. 
+    The pairs are played one after another in this process.
+
+    Parameters
+    ----------
+    strategies : list
+        A list of functions which are the strategies for our interaction matrix.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+    max_games : int, optional
+        The most games played for a pair, by default 10,000.
+    decimal_places : int, optional
+        The chosen number of decimal places that the interaction matrix will return with, by default 3.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False
+    batch : bool, optional
+        If True, each batch of games is played at once with the batch engine, by default False.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator for the games, by default None.
+    batch_size : int, optional
+        The number of games played between each check of the confidence interval, by default 500.
+    target_half_width : float, optional
+        The half width of the confidence interval at which a pair stops, by default 0.01.
+    confidence : float, optional
+        The confidence level of the interval, by default 0.95.
+    ruleset : Ruleset, optional
+        The ruleset the games are played with, as in play_m_games, by default None.
+
+    Returns
+    -------
+    tuple
+        A tuple of three lists of lists; the interaction matrix, the number of games played for each cell and the half width of the 
+        confidence interval of each cell.
+
+    """
+    interaction_matrix = [[0 for i in range(len(strategies))] for j in range(len(strategies))]
+    sample_counts = [[0 for i in range(len(strategies))] for j in range(len(strategies))]
+    error_bars = [[0 for i in range(len(strategies))] for j in range(len(strategies))]
+    if rng is not None:
+        rng = np.random.default_rng(rng)
+    for i in range(0, len(strategies)):
+        interaction_matrix[i][i] = 0.5
+        for j in range(i + 1, len(strategies)):
+            print("i: " + strategies[i].__name__, "j: " + strategies[j].__name__)
+            results = play_games_until_confident(strat1=strategies[i], strat2=strategies[j], n=n, max_games=max_games, 
+                                                 batch_size=batch_size, target_half_width=target_half_width, confidence=confidence, 
+                                                 accurate_game=accurate_game, batch=batch, rng=rng, ruleset=ruleset)
+            games = results[0] + results[1]
+            interaction_matrix[i][j] = round(results[0] * (1 / games), decimal_places)
+            interaction_matrix[j][i] = round(results[1] * (1 / games), decimal_places)
+            sample_counts[i][j] = sample_counts[j][i] = games
+            error_bars[i][j] = error_bars[j][i] = round(float(wilson_interval_half_width(results[0], games, confidence)), 
+                                                        decimal_places)
+    return interaction_matrix, sample_counts, error_bars
+
+interaction_store_version = 2
+interaction_store_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "interaction_store.json")
+
+def strategy_source(strat):
+    """
+    Gives the source code that a strategy's choices depend on. For a functools.partial, such as a strategy from with_n or 
+    compiled_strategy, this is the source of the wrapped function followed by its fixed arguments, where strategies are replaced by their 
+    own sources and numpy arrays by a hash of their contents. The source of the batch version of a strategy is added when it has one.
+
+    Parameters
+    ----------
+    strat : function
+        The strategy function, or any argument fixed by a functools.partial.
+
+    Returns
+    -------
+    str
+        The source code of the strategy.
+
+    """
+    if isinstance(strat, functools.partial):
+        arguments = list(strat.args) + [(key, value) for key, value in sorted(strat.keywords.items())]
+        parts = [strategy_source(strat.func)]
+        for argument in arguments:
+            key, value = argument if isinstance(argument, tuple) else (None, argument)
+            if callable(value):
+                part = strategy_source(value)
+            elif isinstance(value, np.ndarray):
+                part = hashlib.sha1(np.ascontiguousarray(value).tobytes() + str(value.shape).encode()).hexdigest()
+            else:
+                part = repr(value)
+            parts.append(part if key is None else key + "=" + part)
+        source = "\n".join(parts)
+    else:
+        try:
+            source = inspect.getsource(strat)
+        except (OSError, TypeError):
+            source = ""
+    if hasattr(strat, "batch_strategy"):
+        source += "\n" + strategy_source(strat.batch_strategy)
+    return source
+
+def strategy_identity(strat):
+    """
+    Gives a strategy an identity made of its name and a short hash of its source code from strategy_source, so that results for a 
+    strategy are no longer reused once it, the strategy it wraps or its batch version is edited.
+
+    Parameters
+    ----------
+    strat : function
+        The strategy function.
+
+    Returns
+    -------
+    str
+        The identity of the strategy.
+
+    """
+    return strat.__name__ + ":" + hashlib.sha1(strategy_source(strat).encode()).hexdigest()[:12]
+
+def engine_identity():
+    """
+    Gives the game engine a short hash of the source code of the functions that play games, so that stored results are no longer reused 
+    once the engine is edited.
+
+    Returns
+    -------
+    str
+        The identity of the engine.
+
+    """
+    engine = [play_game_rounds, play_game, play_strategy, gen_opts, accurate_cs_game, play_m_games, batch_two_player_game, 
+              batch_accurate_cs_game, batch_strategy_round_probabilities, table_strategy_probabilities, batch_draw_choices, 
+              batch_sample_choices]
+    source = "\n".join(inspect.getsource(function) for function in engine)
+    return hashlib.sha1(source.encode()).hexdigest()[:12]
+
+def ruleset_identity(ruleset=None):
+    """
+    Gives the rules a short hash, so that stored results are only reused for the same rules.
+
+    Parameters
+    ----------
+    ruleset : Ruleset, optional
+        The ruleset. If None, the current complete_options_list, win_rewards and loss_rewards are used, by default None.
+
+    Returns
+    -------
+    str
+        The identity of the rules.
+
+    """
+    if ruleset is None:
+        return hashlib.sha1(json.dumps([complete_options_list, win_rewards, loss_rewards]).encode()).hexdigest()[:12]
+    rules = [ruleset.options.tolist(), ruleset.win_rewards, ruleset.loss_rewards, ruleset.loss_bonus_ladder, ruleset.max_money, 
+             ruleset.starting_money, ruleset.first_to_or_set_number, ruleset.play_to, ruleset.halftime, ruleset.overtime_half_length, 
+             ruleset.overtime_money, ruleset.loss_bonuses]
+    return hashlib.sha1(json.dumps(rules).encode()).hexdigest()[:12]
+
+def pair_key(strat1, strat2, n=5, accurate_game=False, ruleset=None):
+    """
+    Gives the key that the results of strat1 against strat2 are stored under in the interaction store.
+
+    Parameters
+    ----------
+    strat1 : function
+        The strategy function for player 1.
+    strat2 : function
+        The strategy function for player 2.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False.
+    ruleset : Ruleset, optional
+        The ruleset the games are played with, by default None.
+
+    Returns
+    -------
+    str
+        The key for the pair.
+
+    """
+    return "|".join([strategy_identity(strat1), strategy_identity(strat2), "n=" + str(n), "accurate_game=" + str(accurate_game), 
+                     "rules=" + ruleset_identity(ruleset), "engine=" + engine_identity()])
+
+def load_interaction_store(path=interaction_store_path):
+    """
+    Loads the interaction store, a json file of the total wins of each pair of strategies over every run so far. A missing file or a file 
+    from a different version gives an empty store.
+
+    Parameters
+    ----------
+    path : str, optional
+        The file the store is kept in, by default interaction_store_path.
+
+    Returns
+    -------
+    dict
+        A dictionary with the store version and a dictionary mapping each pair key to the wins of player 1 and player 2.
+
+    """
+    if os.path.exists(path):
+        with open(path) as file:
+            store = json.load(file)
+        if store.get("version") == interaction_store_version:
+            return store
+    return {"version": interaction_store_version, "pairs": {}}
+
+def save_interaction_store(store, path=interaction_store_path):
+    """
+    Saves the interaction store to a json file.
+
+    Parameters
+    ----------
+    store : dict
+        The store from load_interaction_store.
+    path : str, optional
+        The file the store is kept in, by default interaction_store_path.
+
+    Returns
+    -------
+    None.
+
+    """
+    with open(path, "w") as file:
+        json.dump(store, file, indent=1)
+
+def generate_interaction_matrix_incremental(strategies, n=5, sample_size=1_000, decimal_places=3, accurate_game=False, batch=False, 
+                                            rng=None, path=interaction_store_path, ruleset=None):
+    """
+    Generates the same interaction matrix as generate_interaction_matrix, but reuses the results kept in the interaction store. A pair 
+    only plays the games it needs to reach sample_size, and new games are added to the stored totals, so adding a strategy only plays its 
+    new pairs and asking for a larger sample_size sharpens every pair. With an int seed, the new games of a pair are played with a 
+    generator seeded by the seed, the pair and the number of games already stored, so a top up plays different games to the ones it adds 
+    to while reruns stay reproducible.
+
+    Parameters
+    ----------
+    strategies : list
+        A list of functions which are the strategies for our interaction matrix.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+    sample_size : int, optional
+        The least number of games each pair should have been played for, by default 1,000.
+    decimal_places : int, optional
+        The chosen number of decimal places that the interaction matrix will return with, by default 3.
     accurate_game : bool, optional
         A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False
-    
+    batch : bool, optional
+        If True, the games for each pair of strategies are played at once with the batch engine, by default False.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator for any new games, by default None. A generator is used as it is for every pair.
+    path : str, optional
+        The file the store is kept in, by default interaction_store_path.
+    ruleset : Ruleset, optional
+        The ruleset the games are played with, as in play_m_games, by default None.
+
     Returns
     -------
     tuple
-        A tuple containing two lists; save_first_n_winrates and other_strategy_winrates.
-        save_first_n_winrates : list
-            A list of the win rates for save_first_n strategy for values of n from 0 to play_to.
-        other_strategy_winrates : list
-            A list of the win rates for the other strategy for values of n from 0 to play_to.
+        A tuple containing two lists of lists; the interaction matrix and the number of games each cell is based on.
 
     """
-    save_first_first_n_winrates = []
-    other_strategy_winrates = []
-    for n in range(0, play_to):
-        save_first_first_n_wins, other_strategy_wins = play_m_games(strat1=save_first_n_selection, strat2=other_strategy, n=n, 
-                                                                    m=number_of_games, play_to=play_to, accurate_game=accurate_game)
-        save_first_first_n_winrate = save_first_first_n_wins / number_of_games
-        other_strategy_winrate = other_strategy_wins / number_of_games
-        save_first_first_n_winrates.append(save_first_first_n_winrate)
-        other_strategy_winrates.append(other_strategy_winrate)
-    return save_first_first_n_winrates, other_strategy_winrates
+    store = load_interaction_store(path)
+    interaction_matrix = [[0 for i in range(len(strategies))] for j in range(len(strategies))]
+    sample_counts = [[0 for i in range(len(strategies))] for j in range(len(strategies))]
+    options = (ruleset if ruleset is not None else default_ruleset).options
+    # results with the players swapped can only be reused when the rules are the same for both players, which they are when the options 
+    # matrix is constant sum. Otherwise both orders of each pair are played.
+    constant_sum = options.shape[0] == options.shape[1] and np.allclose(options + options.T, 1)
+    for i in range(0, len(strategies)):
+        interaction_matrix[i][i] = 0.5
+        for j in range(0, len(strategies)):
+            if j == i or (constant_sum == True and j < i):
+                continue
+            key = pair_key(strategies[i], strategies[j], n=n, accurate_game=accurate_game, ruleset=ruleset)
+            reversed_key = pair_key(strategies[j], strategies[i], n=n, accurate_game=accurate_game, ruleset=ruleset)
+            swapped = constant_sum == True and key not in store["pairs"] and reversed_key in store["pairs"]
+            if swapped == True:
+                results = store["pairs"][reversed_key][::-1]
+            else:
+                results = store["pairs"].get(key, [0, 0])
+            games_so_far = results[0] + results[1]
+            games_needed = sample_size - games_so_far
+            if games_needed > 0:
+                print("i: " + strategies[i].__name__, "j: " + strategies[j].__name__)
+                pair_rng = rng
+                if isinstance(rng, (int, np.integer)):
+                    # reusing the seed itself would replay the games that are already stored.
+                    stored_key = reversed_key if swapped == True else key
+                    pair_rng = np.random.default_rng([int(rng), int(hashlib.sha1(stored_key.encode()).hexdigest()[:8], 16), 
+                                                      games_so_far])
+                new_results = play_m_games(strat1=strategies[i], strat2=strategies[j], n=n, m=games_needed, accurate_game=accurate_game, 
+                                           batch=batch, rng=pair_rng, ruleset=ruleset)
+                results = [results[0] + new_results[0], results[1] + new_results[1]]
+                if swapped == True:
+                    store["pairs"][reversed_key] = results[::-1]
+                else:
+                    store["pairs"][key] = results
+                save_interaction_store(store, path)
+            games = results[0] + results[1]
+            interaction_matrix[i][j] = round(results[0] * (1 / games), decimal_places)
+            sample_counts[i][j] = games
+            if constant_sum == True:
+                interaction_matrix[j][i] = round(results[1] * (1 / games), decimal_places)
+                sample_counts[j][i] = games
+    return interaction_matrix, sample_counts
 
-def graph_save_first_n_against_other_strategy(save_first_n_selection=save_first_n_rounds, other_strategy=short_term, play_to=13, 
-                                              number_of_games=1_000, accurate_game=False):
+results_store_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results_store")
+
+def result_identity(kind, parameters):
     """
-    A function to show interactions on a graph between save first n against another strategy depending on the value of n.
+    Gives the file name that a result is kept under in the results store, made of the kind of result and a hash of everything it was 
+    computed from. Strategies are replaced by their identities, numpy arrays by a hash of their contents and a "ruleset" parameter by its 
+    identity, and the identity of the engine is added.
 
     Parameters
     ----------
-    save_first_n_selection : function, optional
-        The chosen strategy which depends on n, such as save_first_n_rounds_then_lil_then_short_term, by default save_first_n_rounds.
-    other_strategy : function, optional
-        The chosen strategy to play against the save_first_n_selection strategy, by default short_term.
-    play_to : int or float, optional
-        The required number of round wins for a player to win a game, by default 13.
-    number_of_games : int, optional
-        The given number of games for the player 1 strategy to play against player 2 strategy, by default 1,000.
-    accurate_game : bool, optional
-        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False
-    
-    
+    kind : str
+        The kind of result, such as "interaction_matrix".
+    parameters : dict
+        The strategies, settings, ruleset and seed that the result was computed from.
+
     Returns
     -------
-    None.
-        Displays the graph comparing win rates for different values of n.
+    str
+        The file name of the result.
 
     """
-    save_first_n_winrates = compare_save_first_n_with_other_strategies_for_different_n(save_first_n_selection=save_first_n_selection, 
-                                                                                       other_strategy=other_strategy, play_to=play_to, 
-                                                                                       number_of_games=number_of_games, 
-                                                                                       accurate_game=accurate_game)[0]
-    fig, ax = plt.subplots()
-    ax.set_title(save_first_n_selection.stratname + " vs " + other_strategy.stratname)
-    ax.set_ylabel("winrate")
-    ax.set_xlabel("n")
-    ax.set(ylim=(0, 1))
-    ax.set(xlim=(0, play_to))
-    plt.plot(save_first_n_winrates, 'r-x')
+    def identity(value):
+        if callable(value):
+            return strategy_identity(value)
+        if isinstance(value, (list, tuple)):
+            return [identity(item) for item in value]
+        if isinstance(value, np.ndarray):
+            return hashlib.sha1(np.ascontiguousarray(value).tobytes() + str(value.shape).encode()).hexdigest()
+        return value
+    identities = {key: identity(value) for key, value in parameters.items() if key != "ruleset"}
+    identities["rules"] = ruleset_identity(parameters.get("ruleset"))
+    identities["engine"] = engine_identity()
+    return kind + "-" + hashlib.sha1(json.dumps(identities, sort_keys=True, default=str).encode()).hexdigest()[:16] + ".npy"
 
-    plt.show()
+def cached_result(kind, parameters, compute, path=results_store_path):
+    """
+    Loads a result from the results store, or computes and stores it if it is not there yet. Results are kept as .npy files and are 
+    loaded memory mapped, so reloading even a large result only reads the parts of it that are used. A result with a "seed" parameter 
+    that is not an int is a fresh random sample every time, so it is computed without using the store.
+
+    Parameters
+    ----------
+    kind : str
+        The kind of result, such as "interaction_matrix".
+    parameters : dict
+        The strategies, settings, ruleset and seed that the result is computed from.
+    compute : function
+        A function with no arguments that computes the result as something numpy can turn into an array.
+    path : str, optional
+        The folder the results store is kept in, by default results_store_path.
+
+    Returns
+    -------
+    np.array
+        The result, as a read only memory mapped numpy array, or an ordinary numpy array when it was not stored.
 
-def generate_interaction_matrix(strategies, n=5, sample_size=1_000, decimal_places=3, accurate_game=False):
     """
-    Given a list of strategies this function plays sample_size number of games of each strategy against each other strategy to generate a 
-    matrix which has the win rate of each strategy against each other. 
-    
+    seed = parameters.get("seed", 0)
+    if not isinstance(seed, (int, np.integer)) or isinstance(seed, bool):
+        return np.asarray(compute())
+    file_path = os.path.join(path, result_identity(kind, parameters))
+    if not os.path.exists(file_path):
+        result = np.asarray(compute())
+        os.makedirs(path, exist_ok=True)
+        temporary_path = file_path + ".tmp.npy"
+        np.save(temporary_path, result)
+        os.replace(temporary_path, file_path)
+    return np.load(file_path, mmap_mode="r")
+
+def cached_interaction_matrix(strategies, n=5, sample_size=1_000, decimal_places=3, accurate_game=False, batch=False, processes=None, 
+                              seed=None, ruleset=None, path=results_store_path):
+    """
+    Gives the interaction matrix from generate_interaction_matrix, loading it from the results store if it has already been generated 
+    for the same strategies, settings, ruleset and seed. Without an int seed the matrix is generated without using the store.
+
     Parameters
     ----------
     strategies : list
@@ -954,26 +3523,103 @@ def generate_interaction_matrix(strategies, n=5, sample_size=1_000, decimal_plac
         The chosen number of decimal places that the interaction matrix will return with, by default 3.
     accurate_game : bool, optional
         A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default False
-    
+    batch : bool, optional
+        If True, the games for each pair of strategies are played at once with the batch engine, by default False.
+    processes : int, optional
+        If given, the pairs of strategies are split across this many worker processes, as in generate_interaction_matrix, by default None.
+    seed : int, optional
+        The seed for the games, by default None.
+    ruleset : Ruleset, optional
+        The ruleset the games are played with, as in play_m_games, by default None.
+    path : str, optional
+        The folder the results store is kept in, by default results_store_path.
+
     Returns
     -------
-    list
-        A list of lists representing our interaction matrix, can be put into a numpy array.
+    np.array
+        The interaction matrix.
 
     """
-    interaction_matrix = [[0 for i in range(len(strategies))] for j in range(len(strategies))]
-    for i in range(0, len(strategies)):
-        for j in range(i, len(strategies)):
-            print("i: " + strategies[i].__name__, "j: " + strategies[j].__name__)
-            if i == j:
-                interaction_matrix[i][i] = 0.5
-            else:
-                results = play_m_games(strat1=strategies[i], strat2=strategies[j], n=n, m=sample_size, accurate_game=accurate_game)
-                interaction_matrix[i][j] = round(results[0] * (1 / sample_size), decimal_places)
-                interaction_matrix[j][i] = round(results[1] * (1 / sample_size), decimal_places)
+    # worker processes draw from generators spawned from the seed, so they give a different matrix to a single process.
+    parameters = {"strategies": strategies, "n": n, "sample_size": sample_size, "decimal_places": decimal_places, 
+                  "accurate_game": accurate_game, "batch": batch, "processes": processes is not None, "seed": seed, "ruleset": ruleset}
+    return cached_result("interaction_matrix", parameters, lambda: generate_interaction_matrix(strategies, n=n, sample_size=sample_size, 
+                         decimal_places=decimal_places, accurate_game=accurate_game, batch=batch, processes=processes, rng=seed, 
+                         ruleset=ruleset), path=path)
+
+def cached_game_history(strat1, strat2, n=5, accurate_game=True, loss_bonuses=True, play_to=13, seed=None, path=results_store_path):
+    """
+    Gives the points and money of each player at every round of a single game, loading them from the results store if the game has 
+    already been played for the same strategies, settings and seed. Without an int seed the game is played without using the store. The 
+    output can be passed straight to graph_it_out.
+
+    Parameters
+    ----------
+    strat1 : function
+        The strategy function for player 1.
+    strat2 : function
+        The strategy function for player 2.
+    n : int, optional
+        A chosen value for strategies such as save_first_n_rounds, by default 5.
+    accurate_game : bool, optional
+        A boolean deciding whether the game format is accurate game (True) or simply first to some number of wins, by default True.
+    loss_bonuses : bool, optional
+        If True, players receive a loss bonus after losing a round, by default True.
+    play_to : int, optional
+        The number of round wins needed to win when not an accurate game, by default 13.
+    seed : int, optional
+        The seed for the game, by default None.
+    path : str, optional
+        The folder the results store is kept in, by default results_store_path.
+
+    Returns
+    -------
+    tuple
+        A tuple containing four numpy arrays; team1score, team2score, team1money and team2money.
+
+    """
+    def play():
+        if accurate_game == True:
+            points_over_time, money_over_time = accurate_cs_game(strat1, strat2, n=n, loss_bonuses=loss_bonuses, rng=seed, 
+                                                                 history="compact")
+        else:
+            points_over_time, money_over_time = two_player_game(strat1, strat2, play_to=play_to, n=n, loss_bonuses=loss_bonuses, 
+                                                                rng=seed, history="compact")
+        return np.concatenate((points_over_time, money_over_time), axis=1)
+    parameters = {"strat1": strat1, "strat2": strat2, "n": n, "accurate_game": accurate_game, "loss_bonuses": loss_bonuses, 
+                  "play_to": play_to, "seed": seed}
+    history = cached_result("game_history", parameters, play, path=path)
+    return history[:, 0], history[:, 1], history[:, 2], history[:, 3]
+
+def cached_replicator_dynamics(game_matrix, iterations=100, samples=100, method="nashpy", path=results_store_path):
+    """
+    Gives the population shares over time from replicator_dynamics, loading them from the results store if they have already been 
+    found for the same matrix and settings. The output can be passed straight to replicator_dynamics_graph.
+
+    Parameters
+    ----------
+    game_matrix : list
+        A list of lists representing our matrix with win rates for each strategy against each other strategy.
+    iterations : int, optional
+        The length of time we want to run the replicator dynamics for, by default 100.
+    samples : int, optional
+        The number of points in time to find the population shares at, by default 100.
+    method : str, optional
+        The method used by replicator_dynamics, by default "nashpy".
+    path : str, optional
+        The folder the results store is kept in, by default results_store_path.
+
+    Returns
+    -------
+    np.array
+        The population share of each strategy at each sample.
+
+    """
+    game_matrix = np.asarray(game_matrix, dtype=float)
+    parameters = {"game_matrix": game_matrix, "iterations": iterations, "samples": samples, "method": method}
+    return cached_result("replicator_dynamics", parameters, lambda: replicator_dynamics(game_matrix, iterations=iterations, 
+                         samples=samples, method=method), path=path)
 
-    return interaction_matrix
-            
 def display_interaction_matrix(matrix, strategies):
     """
     A function to print the interaction matrix nicely.
@@ -992,9 +3638,10 @@ def display_interaction_matrix(matrix, strategies):
 
     """
     for i in range(0, len(matrix)):
-        print (f"{strategies[i].stratname:30} {matrix[i]}")
+        # stratname is only set once a strategy has been called, which it may not have been if the matrix was loaded from a store.
+        print (f"{getattr(strategies[i], 'stratname', strategies[i].__name__):30} {matrix[i]}")
 
-def replicator_dynamics(game_matrix, iterations=100, samples=100):
+def replicator_dynamics(game_matrix, iterations=100, samples=100, method="nashpy", populations=None, convergence_tolerance=1e-10):
     """
     Uses nashpy replicator dynamics with the interaction matrix to show which strategies survive over time.
 
@@ -1006,6 +3653,15 @@ def replicator_dynamics(game_matrix, iterations=100, samples=100):
         The number of games that we run replicator dynamics for, by default 100.
     samples : int, optional
         How frequently we want to sample the population, by default 100.
+    method : str, optional
+        If "nashpy", nashpy's replicator dynamics is used.
+        If "adaptive" or "discrete", integrate_replicator_dynamics is used instead.
+        By default "nashpy".
+    populations : np.array, optional
+        The starting population, or a 2D numpy array of starting populations to run together, for the "adaptive" and "discrete" methods.
+        By default None, which starts from an equal share of every strategy.
+    convergence_tolerance : float, optional
+        The largest change in any population share per game at which the "adaptive" and "discrete" methods stop early, by default 1e-10.
 
     Returns
     -------
@@ -1013,11 +3669,423 @@ def replicator_dynamics(game_matrix, iterations=100, samples=100):
         The population distribution of all strategies over time.
 
     """
+    if method != "nashpy":
+        return integrate_replicator_dynamics(game_matrix, populations=populations, iterations=iterations, samples=samples, 
+                                             method=method, convergence_tolerance=convergence_tolerance)
+    import nashpy as nash
     timepoints = np.linspace(0, iterations, samples)
     game = nash.Game(game_matrix)
     replicator_game = game.replicator_dynamics(timepoints=timepoints)
     return replicator_game
+
+def replicator_derivative(game_matrix, populations):
+    """
+    Finds the rate of change of every population share under replicator dynamics for a batch of populations at once.
+
+    Parameters
+    ----------
+    game_matrix : np.array
+        A 2D numpy array with the win rates of each strategy against each other strategy, or a 3D numpy array with one matrix per 
+        population.
+    populations : np.array
+        A 2D numpy array with one population per row.
+
+    Returns
+    -------
+    np.array
+        A 2D numpy array with the rate of change of each population share.
+
+    """
+    # einsum is much quicker than a broadcast matmul for many small matrices.
+    if game_matrix.ndim == 2:
+        fitness = np.einsum("ij,rj->ri", game_matrix, populations)
+    else:
+        fitness = np.einsum("rij,rj->ri", game_matrix, populations)
+    average_fitness = np.einsum("ri,ri->r", populations, fitness)[:, None]
+    return populations * (fitness - average_fitness)
+
+def integrate_replicator_dynamics(game_matrix, populations=None, iterations=100, samples=100, method="adaptive", relative_tolerance=1e-6, 
+                                  absolute_tolerance=1e-9, convergence_tolerance=1e-10):
+    """
+    Integrates replicator dynamics for one or many starting populations at once without nashpy. The "adaptive" method is an embedded 
+    Runge-Kutta (Bogacki-Shampine 2(3)) integrator which grows or shrinks the step of each population separately to keep its error within 
+    the tolerances, and interpolates the samples that fall inside a step. The "discrete" method plays discrete generations, where each 
+    strategy's share is multiplied by its fitness over the average fitness once per game. A population that has stopped changing fills its 
+    remaining samples with where it ended, and both methods stop once every population has.
+
+    Parameters
+    ----------
+    game_matrix : list
+        A list of lists representing our matrix with win rates for each strategy against each other strategy, or a 3D numpy array with 
+        one matrix per starting population.
+    populations : np.array, optional
+        The starting population, or a 2D numpy array with one starting population per row, by default None which starts from an equal 
+        share of every strategy.
+    iterations : int, optional
+        The number of games that we run replicator dynamics for, by default 100.
+    samples : int, optional
+        How frequently we want to sample the population, by default 100.
+    method : str, optional
+        Either "adaptive" or "discrete", by default "adaptive".
+    relative_tolerance : float, optional
+        The relative error allowed per step by the "adaptive" method, by default 1e-6.
+    absolute_tolerance : float, optional
+        The absolute error allowed per step by the "adaptive" method, by default 1e-9.
+    convergence_tolerance : float, optional
+        The largest change in any population share per game at which integration stops early, by default 1e-10.
+
+    Returns
+    -------
+    np.array
+        An array of shape (samples, number of strategies) with the population distribution over time, or (samples, number of starting 
+        populations, number of strategies) if a 2D array of starting populations was given.
+
+    """
+    game_matrix = np.asarray(game_matrix, dtype=float)
+    if populations is None:
+        populations = np.full(game_matrix.shape[-1], 1 / game_matrix.shape[-1])
+        if game_matrix.ndim == 3:
+            populations = np.tile(populations, (len(game_matrix), 1))
+    populations = np.asarray(populations, dtype=float)
+    single_population = populations.ndim == 1
+    current = np.atleast_2d(populations).copy()
+    timepoints = np.linspace(0, iterations, samples)
+    outcome = np.zeros((samples,) + current.shape)
+    outcome[0] = current
+
+    if method == "discrete":
+        sample_index = 1
+        for generation in range(1, int(np.ceil(timepoints[-1])) + 1):
+            fitness = np.matmul(game_matrix, current[:, :, None])[:, :, 0]
+            average_fitness = np.sum(current * fitness, axis=1, keepdims=True)
+            previous = current
+            current = current * fitness / average_fitness
+            while sample_index < samples and timepoints[sample_index] <= generation:
+                outcome[sample_index] = current
+                sample_index += 1
+            if np.max(np.abs(current - previous)) < convergence_tolerance:
+                break
+        outcome[sample_index:] = current
+        return outcome[:, 0] if single_population else outcome
+
+    # every population has its own step. A population which has reached the last sample or stopped changing is held where it is with a 
+    # step of 0 while the others carry on.
+    elapsed = np.zeros(len(current))
+    step = np.full(len(current), min(0.1, timepoints[-1]) if timepoints[-1] > 0 else 0.0)
+    sample_index = np.ones(len(current), dtype=int)
+    derivative = replicator_derivative(game_matrix, current)
+    while True:
+        running = (sample_index < samples) & (np.max(np.abs(derivative), axis=1) >= convergence_tolerance)
+        if not np.any(running):
+            break
+        step = np.where(running, np.minimum(step, timepoints[-1] - elapsed), 0.0)
+        h = step[:, None]
+        k2 = replicator_derivative(game_matrix, current + h / 2 * derivative)
+        k3 = replicator_derivative(game_matrix, current + 3 * h / 4 * k2)
+        candidate = current + h * (2 / 9 * derivative + 1 / 3 * k2 + 4 / 9 * k3)
+        k4 = replicator_derivative(game_matrix, candidate)
+        error = h * (-5 / 72 * derivative + 1 / 12 * k2 + 1 / 9 * k3 - 1 / 8 * k4)
+        scale = absolute_tolerance + relative_tolerance * np.maximum(np.abs(current), np.abs(candidate))
+        error_norm = np.sqrt(np.mean((error / scale) ** 2, axis=1))
+        accepted = running & (error_norm <= 1)
+        step_end = elapsed + step
+        # samples inside a step are filled in with cubic hermite interpolation between the two ends of the step.
+        filling = np.flatnonzero(accepted & (timepoints[np.minimum(sample_index, samples - 1)] <= step_end + 1e-12))
+        while len(filling) != 0:
+            fraction = ((timepoints[sample_index[filling]] - elapsed[filling]) / step[filling])[:, None]
+            outcome[sample_index[filling], filling] = ((2 * fraction ** 3 - 3 * fraction ** 2 + 1) * current[filling] 
+                                                       + (fraction ** 3 - 2 * fraction ** 2 + fraction) * h[filling] * derivative[filling] 
+                                                       + (-2 * fraction ** 3 + 3 * fraction ** 2) * candidate[filling] 
+                                                       + (fraction ** 3 - fraction ** 2) * h[filling] * k4[filling])
+            sample_index[filling] += 1
+            filling = filling[sample_index[filling] < samples]
+            filling = filling[timepoints[sample_index[filling]] <= step_end[filling] + 1e-12]
+        elapsed = np.where(accepted, step_end, elapsed)
+        current = np.where(accepted[:, None], candidate, current)
+        derivative = np.where(accepted[:, None], k4, derivative)
+        step = step * np.where(error_norm > 0, np.clip(0.9 * np.maximum(error_norm, 1e-300) ** (-1 / 3), 0.2, 5), 5)
+    for run in range(0, len(current)):
+        outcome[sample_index[run]:, run] = current[run]
+    return outcome[:, 0] if single_population else outcome
     
+def bootstrap_interaction_matrices(interaction_matrix, sample_counts, number_of_matrices=100, rng=None):
+    """
+    Resamples an interaction matrix as if every pair had been played again for the same number of games, giving a batch of matrices that 
+    shows how much the win rates could vary.
+
+    Parameters
+    ----------
+    interaction_matrix : list
+        A list of lists representing our matrix with win rates for each strategy against each other strategy.
+    sample_counts : int or list
+        The number of games each cell is based on, either the same for every cell or a list of lists as returned by 
+        generate_interaction_matrix_adaptive or generate_interaction_matrix_incremental.
+    number_of_matrices : int, optional
+        The number of resampled matrices, by default 100.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator for the resampling, by default None.
+
+    Returns
+    -------
+    np.array
+        A 3D numpy array of shape (number_of_matrices, number of strategies, number of strategies) of resampled interaction matrices.
+
+    """
+    rng = np.random.default_rng(rng)
+    interaction_matrix = np.asarray(interaction_matrix, dtype=float)
+    sample_counts = np.broadcast_to(np.maximum(np.asarray(sample_counts), 1), interaction_matrix.shape)
+    upper = np.triu_indices(len(interaction_matrix), 1)
+    wins = rng.binomial(sample_counts[upper], interaction_matrix[upper], size=(number_of_matrices, len(upper[0])))
+    matrices = np.full((number_of_matrices,) + interaction_matrix.shape, 0.5)
+    matrices[:, upper[0], upper[1]] = wins / sample_counts[upper]
+    matrices[:, upper[1], upper[0]] = 1 - matrices[:, upper[0], upper[1]]
+    return matrices
+
+def batch_replicator_dynamics(interaction_matrix, sample_counts=None, number_of_runs=100, iterations=1_000, method="adaptive", rng=None):
+    """
+    Runs replicator dynamics from many random starting populations at once, each on its own resampled interaction matrix if sample_counts 
+    is given, to see how robust the surviving strategies are. Only the start and the end of each run are kept. Every run takes its own 
+    steps, and the runs are stepped together until the one needing the most steps has finished, so 300 runs of the adaptive method take 
+    about three to four times as long as one.
+
+    Parameters
+    ----------
+    interaction_matrix : list
+        A list of lists representing our matrix with win rates for each strategy against each other strategy.
+    sample_counts : int or list, optional
+        The number of games each cell is based on, used to resample the matrix for every run. By default None, which uses the same matrix 
+        for every run.
+    number_of_runs : int, optional
+        The number of runs, by default 100.
+    iterations : int, optional
+        The number of games that we run replicator dynamics for, by default 1,000.
+    method : str, optional
+        Either "adaptive" or "discrete", see integrate_replicator_dynamics, by default "adaptive".
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator for the starting populations and resampling, by default None.
+
+    Returns
+    -------
+    np.array
+        A 2D numpy array of shape (number_of_runs, number of strategies) with the final population distribution of each run.
+
+    """
+    rng = np.random.default_rng(rng)
+    interaction_matrix = np.asarray(interaction_matrix, dtype=float)
+    starting_populations = rng.dirichlet(np.ones(len(interaction_matrix)), size=number_of_runs)
+    if sample_counts is not None:
+        game_matrix = bootstrap_interaction_matrices(interaction_matrix, sample_counts, number_of_matrices=number_of_runs, rng=rng)
+    else:
+        game_matrix = interaction_matrix
+    return integrate_replicator_dynamics(game_matrix, populations=starting_populations, iterations=iterations, samples=2, 
+                                         method=method)[-1]
+
+def display_population_distribution(final_populations, strategies, survival_threshold=0.01):
+    """
+    A function to print the distribution of final population shares from batch_replicator_dynamics nicely.
+
+    Parameters
+    ----------
+    final_populations : np.array
+        A 2D numpy array with the final population distribution of each run.
+    strategies : list
+        The list of all strategies in the interaction matrix.
+    survival_threshold : float, optional
+        The population share above which a strategy counts as surviving a run, by default 0.01.
+
+    Returns
+    -------
+    None.
+        Prints the mean share, the 5th and 95th percentile shares and how often each strategy survived, row by row.
+
+    """
+    print(f"{'':30} {'mean':>6} {'5%':>6} {'95%':>6} {'survived':>8}")
+    for i in range(0, len(strategies)):
+        shares = final_populations[:, i]
+        # stratname is only set once a strategy has been played.
+        name = getattr(strategies[i], "stratname", strategies[i].__name__)
+        print(f"{name:30} {shares.mean():6.3f} {np.percentile(shares, 5):6.3f} {np.percentile(shares, 95):6.3f} "
+              f"{np.mean(shares > survival_threshold):8.2f}")
+
+# Finite populations:
+
+def invasion_fitness(game_matrix, mutant, resident, population_size, mutants, selection_intensity=1.0):
+    """
+    Finds the fitness of a mutant and a resident strategy in a finite, well mixed population where everyone plays everyone else, for an 
+    array of mutant counts at once. A selection intensity of 1 makes fitness the average win rate, and 0 makes selection neutral.
+
+    Parameters
+    ----------
+    game_matrix : list
+        A list of lists representing our matrix with win rates for each strategy against each other strategy.
+    mutant : int
+        The index of the mutant strategy in the matrix.
+    resident : int
+        The index of the resident strategy in the matrix.
+    population_size : int
+        The number of players in the population.
+    mutants : np.array
+        The number of mutants in each population.
+    selection_intensity : float, optional
+        How strongly win rates decide fitness, between 0 and 1, by default 1.0.
+
+    Returns
+    -------
+    tuple
+        A tuple containing two numpy arrays; mutant_fitness and resident_fitness.
+
+    """
+    game_matrix = np.asarray(game_matrix, dtype=float)
+    mutants = np.asarray(mutants, dtype=float)
+    mutant_payoff = (game_matrix[mutant, mutant] * (mutants - 1) + game_matrix[mutant, resident] * (population_size - mutants)) / (
+        population_size - 1)
+    resident_payoff = (game_matrix[resident, mutant] * mutants + game_matrix[resident, resident] * (population_size - mutants - 1)) / (
+        population_size - 1)
+    return 1 - selection_intensity + selection_intensity * mutant_payoff, 1 - selection_intensity + selection_intensity * resident_payoff
+
+def moran_step_probabilities(game_matrix, mutant, resident, population_size, mutants, selection_intensity=1.0):
+    """
+    Finds the probability that one step of a birth death Moran process adds a mutant and the probability that it removes one.
+
+    Parameters
+    ----------
+    game_matrix : list
+        A list of lists representing our matrix with win rates for each strategy against each other strategy.
+    mutant : int
+        The index of the mutant strategy in the matrix.
+    resident : int
+        The index of the resident strategy in the matrix.
+    population_size : int
+        The number of players in the population.
+    mutants : np.array
+        The number of mutants in each population.
+    selection_intensity : float, optional
+        How strongly win rates decide fitness, between 0 and 1, by default 1.0.
+
+    Returns
+    -------
+    tuple
+        A tuple containing two numpy arrays; increase and decrease.
+
+    """
+    mutant_fitness, resident_fitness = invasion_fitness(game_matrix, mutant, resident, population_size, mutants, selection_intensity)
+    total_fitness = mutants * mutant_fitness + (population_size - mutants) * resident_fitness
+    increase = mutants * mutant_fitness / total_fitness * (population_size - mutants) / population_size
+    decrease = (population_size - mutants) * resident_fitness / total_fitness * mutants / population_size
+    return increase, decrease
+
+def moran_fixation(game_matrix, mutant, resident, population_size=100, selection_intensity=1.0, initial_mutants=1):
+    """
+    Finds the exact probability that a mutant strategy takes over a resident population in a birth death Moran process, the expected 
+    number of steps it takes to do so in the runs where it does, and the expected number of steps until either strategy has taken over, 
+    by solving the linear equations of the absorbing Markov chain.
+
+    Parameters
+    ----------
+    game_matrix : list
+        A list of lists representing our matrix with win rates for each strategy against each other strategy.
+    mutant : int
+        The index of the mutant strategy in the matrix.
+    resident : int
+        The index of the resident strategy in the matrix.
+    population_size : int, optional
+        The number of players in the population, by default 100.
+    selection_intensity : float, optional
+        How strongly win rates decide fitness, between 0 and 1, by default 1.0.
+    initial_mutants : int, optional
+        The number of mutants at the start, by default 1.
+
+    Returns
+    -------
+    tuple
+        A tuple containing three floats; fixation_probability, fixation_time and absorption_time.
+        fixation_probability : float
+            The probability that the mutants take over the population.
+        fixation_time : float
+            The expected number of steps until the mutants have taken over the population, given that they do.
+        absorption_time : float
+            The expected number of steps until either strategy has taken over the population, whichever it is.
+
+    """
+    mutants = np.arange(1, population_size)
+    increase, decrease = moran_step_probabilities(game_matrix, mutant, resident, population_size, mutants, selection_intensity)
+    transient = np.diag(1 - increase - decrease) + np.diag(increase[:-1], 1) + np.diag(decrease[1:], -1)
+    fixation_step = np.zeros(population_size - 1)
+    fixation_step[-1] = increase[-1]
+    system = np.eye(population_size - 1) - transient
+    fixation_probabilities = np.linalg.solve(system, fixation_step)
+    absorption_times = np.linalg.solve(system, np.ones(population_size - 1))
+    # the expected steps counted only in runs that fix, which divided by the fixation probability gives the conditional time.
+    fixation_weighted_times = np.linalg.solve(system, fixation_probabilities)
+    fixation_probability = float(fixation_probabilities[initial_mutants - 1])
+    fixation_time = float(fixation_weighted_times[initial_mutants - 1] / fixation_probability) if fixation_probability > 0 else np.inf
+    return fixation_probability, fixation_time, float(absorption_times[initial_mutants - 1])
+
+def simulate_invasion(game_matrix, mutant, resident, population_size=100, number_of_runs=10_000, selection_intensity=1.0, 
+                      process="moran", initial_mutants=1, max_steps=10_000_000, rng=None):
+    """
+    Simulates many independent invasions of a resident population by a mutant strategy at once, stepping every unfinished run forward 
+    together until one strategy has taken over.
+
+    Parameters
+    ----------
+    game_matrix : list
+        A list of lists representing our matrix with win rates for each strategy against each other strategy.
+    mutant : int
+        The index of the mutant strategy in the matrix.
+    resident : int
+        The index of the resident strategy in the matrix.
+    population_size : int, optional
+        The number of players in the population, by default 100.
+    number_of_runs : int, optional
+        The number of independent runs, by default 10,000.
+    selection_intensity : float, optional
+        How strongly win rates decide fitness, between 0 and 1, by default 1.0.
+    process : str, optional
+        If "moran", one player is replaced each step (birth death Moran process).
+        If "wright-fisher", the whole population is replaced each step.
+        By default "moran".
+    initial_mutants : int, optional
+        The number of mutants at the start, by default 1.
+    max_steps : int, optional
+        The most steps a run is allowed before it is stopped unfinished, by default 10,000,000.
+    rng : int or np.random.Generator, optional
+        A seed or numpy generator for the runs, by default None.
+
+    Returns
+    -------
+    tuple
+        A tuple containing two numpy arrays; fixated and steps.
+        fixated : np.array
+            Whether the mutants took over the population in each run.
+        steps : np.array
+            The number of steps each run took until either strategy had taken over. steps[fixated] are the fixation times of the runs 
+            the mutants won, so steps[fixated].mean() estimates the fixation_time of moran_fixation and steps.mean() its 
+            absorption_time.
+
+    """
+    rng = np.random.default_rng(rng)
+    mutants = np.full(number_of_runs, initial_mutants)
+    steps = np.zeros(number_of_runs, dtype=int)
+    active = np.flatnonzero((mutants > 0) & (mutants < population_size))
+    step = 0
+    while len(active) != 0 and step < max_steps:
+        if process == "moran":
+            increase, decrease = moran_step_probabilities(game_matrix, mutant, resident, population_size, mutants[active], 
+                                                          selection_intensity)
+            rand_values = rng.random(len(active))
+            mutants[active] += (rand_values < increase).astype(int) - ((rand_values >= increase) & (rand_values < increase + decrease))
+        else:
+            mutant_fitness, resident_fitness = invasion_fitness(game_matrix, mutant, resident, population_size, mutants[active], 
+                                                                selection_intensity)
+            mutant_share = mutants[active] * mutant_fitness / (mutants[active] * mutant_fitness 
+                                                               + (population_size - mutants[active]) * resident_fitness)
+            mutants[active] = rng.binomial(population_size, mutant_share)
+        step += 1
+        steps[active] = step
+        active = active[(mutants[active] > 0) & (mutants[active] < population_size)]
+    return mutants == population_size, steps
+
 def replicator_dynamics_graph(outcome_array, strat_names):
     """
     A function to plot the replicator dynamics graph.
@@ -1038,6 +4106,8 @@ def replicator_dynamics_graph(outcome_array, strat_names):
     x = np.linspace(0, len(outcome_array), len(outcome_array))
     y_vals = outcome_array
     y_vals = list(map(list, zip(*outcome_array)))   #transposes outcome array
+    import matplotlib.pyplot as plt
+    import mplcursors
     fig, ax = plt.subplots()
     lines=[]
     for line_index in range(0,len(y_vals)):
@@ -1050,22 +4120,97 @@ def replicator_dynamics_graph(outcome_array, strat_names):
     plt.show()
 
 
-#Single game:
-scores, money = accurate_cs_game(strat1=bi4nxt2, strat2=short_term, n=5, loss_bonuses=True)
-team1score, team2score, team1money, team2money = unpack_points_over_time_and_money_over_time(scores, money)
-graph_it_out(team1score, team2score, team1money, team2money, strat1=bi4nxt2, strat2=short_term, first_to=13, max_money=16)
+# Command line:
+
+demo_strategies = [short_term, save_first_n_rounds, save_if_down_on_money, save_til_4_strat, save_til_n_eco, bi4nxt, 
+                   never_half, save_if_down_on_money2, save_til_4_strat2, save_til_n_eco2, save_first_n_rounds2, 
+                   save_first_n_rounds_and_stay_above_m_eco2, bi4nxt2, never_half2]
 
+named_strategies = {strat.__name__: strat for strat in [
+                    support_enumerator_strat, short_term, save_til_4_strat, save_til_n_eco, save_first_n_rounds, 
+                    save_first_n_rounds_and_stay_above_m_eco, random_strat, save_til_death, bi4nxt, never_half, 
+                    save_first_n_rounds_then_lil_then_short_term, save_first_n_rounds_then_half_then_short_term, save_if_down_on_money, 
+                    bi4nxt_2_rounds, support_enumerator_strat2, save_til_4_strat2, save_til_n_eco2, save_first_n_rounds2, 
+                    save_first_n_rounds_and_stay_above_m_eco2, bi4nxt2, never_half2, save_if_down_on_money2, bi4nxt_2_rounds2, 
+                    save_til_death2, backward_induction_strat]}
 
-# Replicator dynamics stuff:
-strategies = [short_term, save_first_n_rounds, save_if_down_on_money, save_til_4_strat, save_til_n_eco, bi4nxt, 
-              never_half, save_if_down_on_money2, save_til_4_strat2, save_til_n_eco2, save_first_n_rounds2, 
-              save_first_n_rounds_and_stay_above_m_eco2, bi4nxt2, never_half2]
+def main(argv=None):
+    """
+    The command line entry point, with a subcommand for each demo: "game" plays and graphs a single game, "matrix" prints an interaction 
+    matrix and "replicator" graphs replicator dynamics on an interaction matrix.
+
+    Parameters
+    ----------
+    argv : list, optional
+        The command line arguments, by default None which reads them from sys.argv.
+
+    Returns
+    -------
+    None.
+
+    """
+    parser = argparse.ArgumentParser(description="Counterstrike economy game theory simulations.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    game_parser = subparsers.add_parser("game", help="play and graph a single accurate game")
+    game_parser.add_argument("--strat1", choices=named_strategies, default="bi4nxt2")
+    game_parser.add_argument("--strat2", choices=named_strategies, default="short_term")
+    game_parser.add_argument("--n", type=int, default=5)
+    game_parser.add_argument("--seed", type=int, default=None)
+
+    for name, help_text in [("matrix", "print the interaction matrix of the strategies"), 
+                            ("replicator", "graph replicator dynamics on the interaction matrix of the strategies")]:
+        matrix_parser = subparsers.add_parser(name, help=help_text)
+        matrix_parser.add_argument("--strategies", nargs="+", choices=named_strategies, 
+                                   default=[strat.__name__ for strat in demo_strategies])
+        matrix_parser.add_argument("--n", type=int, default=3)
+        matrix_parser.add_argument("--sample-size", type=int, default=10_000)
+        matrix_parser.add_argument("--first-to", action="store_true", help="play first to 13 instead of accurate games")
+        matrix_parser.add_argument("--batch", action="store_true", help="use the batch engine")
+        matrix_parser.add_argument("--processes", type=int, default=None)
+        matrix_parser.add_argument("--seed", type=int, default=None)
+        matrix_parser.add_argument("--cache", action="store_true", help="load and save the matrix in the results store")
+        matrix_parser.add_argument("--profile", action="store_true", help="print where the time went")
+        matrix_parser.add_argument("--profile-output", default=None, help="also write the profile to this json file")
+        if name == "replicator":
+            matrix_parser.add_argument("--iterations", type=int, default=1_000)
+            matrix_parser.add_argument("--samples", type=int, default=5_000)
+
+    args = parser.parse_args(argv)
+    if getattr(args, "cache", False) == True and args.seed is None:
+        parser.error("--cache needs a --seed, as a result without one is a fresh random sample every time")
+
+    if args.command == "game":
+        strat1 = named_strategies[args.strat1]
+        strat2 = named_strategies[args.strat2]
+        scores, money = accurate_cs_game(strat1=strat1, strat2=strat2, n=args.n, loss_bonuses=True, rng=args.seed)
+        team1score, team2score, team1money, team2money = unpack_points_over_time_and_money_over_time(scores, money)
+        graph_it_out(team1score, team2score, team1money, team2money, strat1=strat1, strat2=strat2, first_to=13, max_money=16)
+        return
+
+    strategies = [named_strategies[name] for name in args.strategies]
+    if args.profile == True or args.profile_output is not None:
+        enable_profiling()
+    if args.cache == True:
+        interaction_mat = cached_interaction_matrix(strategies, n=args.n, sample_size=args.sample_size, accurate_game=not args.first_to, 
+                                                    batch=args.batch, processes=args.processes, seed=args.seed).tolist()
+    else:
+        interaction_mat = generate_interaction_matrix(strategies, n=args.n, sample_size=args.sample_size, accurate_game=not args.first_to, 
+                                                      batch=args.batch, processes=args.processes, rng=args.seed)
+    display_interaction_matrix(interaction_mat, strategies)
+    if profile_stats is not None:
+        stats = disable_profiling()
+        if args.profile == True:
+            display_profile(stats)
+        if args.profile_output is not None:
+            save_profile(args.profile_output, stats)
 
-interaction_mat = generate_interaction_matrix(strategies, n=3, sample_size=10_000, accurate_game=True)
-display_interaction_matrix(interaction_mat, strategies)
+    if args.command == "replicator":
+        game_outcome = replicator_dynamics(game_matrix=interaction_mat, iterations=args.iterations, samples=args.samples)
+        stratnames = []
+        for i in strategies:
+            stratnames.append(getattr(i, "stratname", i.__name__))
+        replicator_dynamics_graph(game_outcome, stratnames)
 
-game_outcome = replicator_dynamics(game_matrix=interaction_mat, iterations=1_000, samples=5_000)
-stratnames = []
-for i in strategies:
-    stratnames.append(i.stratname)
-replicator_dynamics_graph(game_outcome, stratnames)
+if __name__ == "__main__":
+    main()
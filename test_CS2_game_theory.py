@@ -0,0 +1,373 @@
+import json
+import os
+import random
+
+import numpy as np
+import pytest
+
+import CS2_game_theory as cs
+
+
+def assert_close_to_probability(wins, games, probability, sigmas=4):
+    # a seeded estimate should be within a few standard errors of the exact value.
+    standard_error = np.sqrt(probability * (1 - probability) / games)
+    assert abs(wins / games - probability) < sigmas * standard_error
+
+
+def strategy_states():
+    for player0_or_1 in range(0, 2):
+        for first_half in (False, True):
+            for round_number in (0, 4, 11, 12, 20):
+                for eco in (1, 1.5, 2, 3, 3.5, 4, 6.5, 16):
+                    for op_eco in (1, 3.5, 16):
+                        for losses_bonus1, losses_bonus2 in ((0, 0), (4, 1)):
+                            yield round_number, eco, op_eco, player0_or_1, losses_bonus1, losses_bonus2, first_half
+
+
+@pytest.mark.parametrize("accurate_game", [False, True])
+def test_batch_and_per_game_win_rates_agree(accurate_game):
+    games = 4_000
+    per_game = cs.play_m_games(cs.bi4nxt2, cs.save_til_4_strat, m=games, accurate_game=accurate_game, rng=1)
+    batch = cs.play_m_games(cs.bi4nxt2, cs.save_til_4_strat, m=games, accurate_game=accurate_game, batch=True, rng=2)
+    probability = (per_game[0] + batch[0]) / (2 * games)
+    assert sum(per_game) == sum(batch) == games
+    assert abs(per_game[0] - batch[0]) / games < 4 * np.sqrt(2 * probability * (1 - probability) / games)
+
+
+def test_sharded_matrix_does_not_depend_on_the_number_of_processes():
+    strategies = [cs.short_term, cs.save_til_4_strat, cs.bi4nxt2]
+    one_process = cs.generate_interaction_matrix(strategies, sample_size=200, batch=True, processes=1, shards_per_pair=2, rng=4)
+    two_processes = cs.generate_interaction_matrix(strategies, sample_size=200, batch=True, processes=2, shards_per_pair=2, rng=4)
+    assert one_process == two_processes
+
+
+def test_seeded_games_are_reproducible():
+    assert cs.two_player_game(cs.random_strat, cs.bi4nxt2, rng=8) == cs.two_player_game(cs.random_strat, cs.bi4nxt2, rng=8)
+    assert cs.play_m_games(cs.random_strat, cs.short_term, m=200, rng=8) == cs.play_m_games(cs.random_strat, cs.short_term, m=200, rng=8)
+
+
+def test_gen_opts_gives_the_corner_of_the_options():
+    for eco1 in (0, 1, 1.5, 2, 3.5, 4, 16):
+        for eco2 in (0, 1, 2.5, 3, 4, 16):
+            game_matrix = cs.gen_opts(eco1, eco2)
+            rows, columns = max(min(4, int(eco1)), 0), max(min(4, int(eco2)), 0)
+            assert np.array_equal(game_matrix, np.array(cs.complete_options_list)[:rows, :columns])
+            assert game_matrix.flags.writeable == False
+
+
+def test_two_rounds_decision_matches_the_lookahead():
+    cs.two_rounds_decision_cache.clear()
+    for eco1 in np.arange(0, 16.5, 0.5):
+        for eco2 in np.arange(0, 16.5, 0.5):
+            for losses_bonus1 in range(0, 5):
+                for losses_bonus2 in range(0, 5):
+                    expected = cs.extensive_form_game_into_normal_form_2_rounds(eco1, eco2, losses_bonus1, losses_bonus2)
+                    assert cs.two_rounds_decision(eco1, eco2, losses_bonus1, losses_bonus2) == expected
+                    # the second call is answered from the cache.
+                    assert cs.two_rounds_decision(eco1, eco2, losses_bonus1, losses_bonus2) == expected
+
+
+def test_cached_equilibria_match_support_enumeration():
+    nash = pytest.importorskip("nashpy")
+    cs.equilibrium_cache.clear()
+    cs.warm_equilibrium_cache()
+    for i in range(1, 5):
+        for j in range(1, 5):
+            expected = next(nash.Game(cs.game_matrix_table[i][j]).support_enumeration())
+            cached = cs.first_equilibrium(cs.game_matrix_table[i][j])
+            assert np.allclose(cached[0], expected[0]) and np.allclose(cached[1], expected[1])
+
+
+@pytest.mark.parametrize("accurate_game", [False, True])
+def test_exact_win_probability_matches_simulation(accurate_game):
+    games = 10_000
+    exact = cs.exact_win_probability(cs.bi4nxt2, cs.short_term, accurate_game=accurate_game)
+    assert exact[0] + exact[1] == pytest.approx(1)
+    batch = cs.play_m_games(cs.bi4nxt2, cs.short_term, m=games, accurate_game=accurate_game, batch=True, rng=3)
+    assert_close_to_probability(batch[0], games, exact[0])
+    per_game = cs.play_m_games(cs.bi4nxt2, cs.short_term, m=2_000, accurate_game=accurate_game, rng=4)
+    assert_close_to_probability(per_game[0], 2_000, exact[0])
+
+
+@pytest.fixture
+def short_ruleset_policy(monkeypatch):
+    # a first to 5 game with a halftime after 4 rounds solves in about a second, where the accurate game takes about 10.
+    ruleset = cs.make_ruleset(max_money=16, play_to=5, halftime=4)
+    values, policy = cs.backward_induction_solve(ruleset=ruleset)
+    monkeypatch.setattr(cs, "backward_induction_policy", cs.compact_backward_induction_policy(policy))
+    return ruleset, values, policy
+
+
+def test_backward_induction_beats_or_ties_short_term(short_ruleset_policy):
+    ruleset, values, policy = short_ruleset_policy
+    assert values.shape == (6, 6, 31, 31, 5, 5)
+    assert policy.shape == (5, 5, 31, 31, 5, 5, 4)
+    assert np.allclose(policy.sum(axis=-1), 1)
+    assert cs.exact_win_probability(cs.backward_induction_strat, cs.short_term, accurate_game=True, ruleset=ruleset)[0] >= 0.5
+    assert cs.exact_win_probability(cs.short_term, cs.backward_induction_strat, accurate_game=True, ruleset=ruleset)[1] >= 0.5
+
+
+def test_missing_backward_induction_policy_warns(monkeypatch, tmp_path):
+    ruleset = cs.make_ruleset(max_money=16, play_to=5, halftime=4)
+    solve = cs.backward_induction_solve
+    monkeypatch.setattr(cs, "backward_induction_solve", lambda: solve(ruleset=ruleset))
+    monkeypatch.setattr(cs, "backward_induction_policy", None)
+    path = str(tmp_path / "backward_induction_policy.npz")
+    with pytest.warns(UserWarning):
+        policy_index, mixed_strats = cs.get_backward_induction_policy(path)
+    assert policy_index.shape == (5, 5, 31, 31, 5, 5)
+    # the policy is only written by solve_backward_induction_policy.
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize("player_strat, rounds", [(cs.bi4nxt2, 25), (cs.save_first_n_rounds2, 25), (cs.never_half2, 25),
+                                                  (cs.with_n(cs.save_til_n_eco2, 3), 25),
+                                                  (cs.save_first_n_rounds_then_lil_then_short_term, 21)])
+def test_compiled_strategy_matches_strategy(player_strat, rounds):
+    compiled = cs.compiled_strategy(player_strat, n=5, rounds=rounds)
+    for round_number, eco, op_eco, player0_or_1, losses_bonus1, losses_bonus2, first_half in strategy_states():
+        game_matrix = cs.gen_opts(eco, op_eco) if player0_or_1 == 0 else cs.gen_opts(op_eco, eco)
+        expected = player_strat(round_number, eco, op_eco, game_matrix, player0_or_1, 5, losses_bonus1, losses_bonus2,
+                                first_half=first_half)
+        actual = compiled(round_number, eco, op_eco, game_matrix, player0_or_1, 5, losses_bonus1, losses_bonus2, first_half=first_half)
+        # some strategies leave out options they never pick, which the table pads with zeros.
+        assert actual == pytest.approx(list(expected) + [0] * (len(actual) - len(expected)))
+
+
+def test_compiled_strategy_plays_the_same_batch_games():
+    compiled = cs.compiled_strategy(cs.bi4nxt2)
+    # the batch version compiles the table, so bi4nxt2 itself may never have been called to set its stratname.
+    assert compiled.stratname == getattr(cs.bi4nxt2, "stratname", cs.bi4nxt2.__name__)
+    for common_random_numbers in (False, True):
+        expected = cs.play_m_games(cs.bi4nxt2, cs.short_term, m=1_000, accurate_game=True, batch=True, rng=6,
+                                   common_random_numbers=common_random_numbers)
+        assert cs.play_m_games(compiled, cs.short_term, m=1_000, accurate_game=True, batch=True, rng=6,
+                               common_random_numbers=common_random_numbers) == expected
+
+
+@pytest.mark.parametrize("history", ["full", "compact", "final"])
+def test_history_modes_play_the_same_game(history):
+    points_over_time, money_over_time = cs.two_player_game(cs.bi4nxt2, cs.random_strat, rng=9)
+    player1choices = cs.two_player_game.player1choices
+    points, money = cs.two_player_game(cs.bi4nxt2, cs.random_strat, rng=9, history=history)
+    if history == "final":
+        assert list(points) == points_over_time[-1] and list(money) == money_over_time[-1]
+    else:
+        assert np.array_equal(points, points_over_time) and np.array_equal(money, money_over_time)
+        assert list(cs.two_player_game.player1choices) == player1choices
+
+
+def test_streamed_rounds_match_the_full_history():
+    points_over_time, money_over_time = cs.two_player_game(cs.bi4nxt2, cs.random_strat, rng=7, ruleset=cs.accurate_ruleset,
+                                                           overtime_half_length=3)
+    player1choices = cs.two_player_game.player1choices
+    rounds = list(cs.two_player_game_rounds(cs.bi4nxt2, cs.random_strat, rng=7, ruleset=cs.accurate_ruleset, overtime_half_length=3))
+    assert [round_[1] for round_ in rounds] == player1choices
+    assert [list(round_[3]) for round_ in rounds] == points_over_time[1:]
+    assert [list(round_[4]) for round_ in rounds] == money_over_time[1:]
+
+
+def test_adaptive_sampling_stops_inside_the_wilson_interval():
+    exact = cs.exact_win_probability(cs.bi4nxt2, cs.save_til_4_strat)[0]
+    results = cs.play_games_until_confident(cs.bi4nxt2, cs.save_til_4_strat, max_games=20_000, target_half_width=0.02, batch=True, rng=2)
+    games = results[0] + results[1]
+    half_width = cs.wilson_interval_half_width(results[0], games)
+    assert half_width < 0.02 and games < 20_000
+    assert abs(results[0] / games - exact) < half_width
+    matrix, sample_counts, error_bars = cs.generate_interaction_matrix_adaptive([cs.bi4nxt2, cs.save_til_4_strat], max_games=20_000,
+                                                                                target_half_width=0.02, batch=True, rng=2)
+    assert error_bars[0][1] <= 0.02 and sample_counts[0][1] == games
+
+
+def test_interaction_store_round_trip_and_top_up(tmp_path):
+    path = str(tmp_path / "interaction_store.json")
+    strategies = [cs.short_term, cs.save_til_4_strat, cs.with_n(cs.save_first_n_rounds, 3)]
+    matrix, counts = cs.generate_interaction_matrix_incremental(strategies, sample_size=300, batch=True, rng=1, path=path)
+    store = cs.load_interaction_store(path)
+    assert len(store["pairs"]) == 3
+    cs.save_interaction_store(store, path)
+    assert cs.load_interaction_store(path) == store
+    assert cs.generate_interaction_matrix_incremental(strategies, sample_size=300, batch=True, rng=1, path=path) == (matrix, counts)
+
+    key = cs.pair_key(strategies[0], strategies[1])
+    first_results = store["pairs"][key]
+    cs.generate_interaction_matrix_incremental(strategies, sample_size=600, batch=True, rng=1, path=path)
+    topped_up_results = cs.load_interaction_store(path)["pairs"][key]
+    assert sum(topped_up_results) == 600
+    # a top up has to play new games rather than replay the stored ones.
+    assert topped_up_results != [2 * wins for wins in first_results]
+
+
+def test_interaction_store_plays_both_orders_when_not_constant_sum(tmp_path):
+    path = str(tmp_path / "interaction_store.json")
+    # player 1 wins every round more often, so the order of a pair matters.
+    ruleset = cs.make_ruleset(options_list=np.minimum(np.array(cs.complete_options_list) + 0.1, 1))
+    strategies = [cs.short_term, cs.bi4nxt2]
+    matrix, counts = cs.generate_interaction_matrix_incremental(strategies, sample_size=300, batch=True, rng=1, path=path, ruleset=ruleset)
+    pairs = cs.load_interaction_store(path)["pairs"]
+    assert len(pairs) == 2
+    reversed_results = pairs[cs.pair_key(strategies[1], strategies[0], ruleset=ruleset)]
+    assert matrix[1][0] == round(reversed_results[0] / 300, 3)
+    assert counts == [[0, 300], [300, 0]]
+
+
+def test_strategy_identity_follows_wrapped_strategies():
+    identities = {cs.strategy_identity(cs.with_n(cs.save_first_n_rounds, 3)).split(":")[1],
+                  cs.strategy_identity(cs.with_n(cs.save_first_n_rounds, 7)).split(":")[1],
+                  cs.strategy_identity(cs.with_n(cs.save_til_n_eco, 3)).split(":")[1]}
+    assert len(identities) == 3
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_common_random_numbers_match_a_plain_comparison(batch):
+    common_seed = int(np.random.default_rng(5).integers(0, 2 ** 63))
+    winrates, other_winrates = cs.compare_save_first_n_with_other_strategies_for_different_n(cs.save_first_n_rounds, cs.short_term, 
+                                                                                             play_to=5, number_of_games=200, batch=batch, 
+                                                                                             rng=5, common_random_numbers=True)
+    for n in range(0, 5):
+        results = cs.play_m_games(cs.save_first_n_rounds, cs.short_term, n=n, m=200, play_to=5, batch=batch, rng=common_seed,
+                                  common_random_numbers=True)
+        assert winrates[n] == results[0] / 200 and other_winrates[n] == results[1] / 200
+
+
+def test_parameter_sweep_shape_and_with_n():
+    strat = cs.with_n(cs.save_first_n_rounds, 3)
+    assert strat.__name__ == "save_first_n_rounds_n3"
+    for round_number in range(0, 6):
+        assert strat(round_number, 4, 4, cs.gen_opts(4, 4), n=9) == cs.save_first_n_rounds(round_number, 4, 4, cs.gen_opts(4, 4), n=3)
+    winrates = cs.parameter_sweep([cs.save_first_n_rounds, cs.save_til_n_eco], [1, 3, 5], [cs.short_term], [0], m=100, rng=1)
+    assert winrates.shape == (2, 3, 1, 1)
+    assert np.all((winrates >= 0) & (winrates <= 1))
+
+
+def test_adaptive_integrator_matches_nashpy():
+    pytest.importorskip("nashpy")
+    game_matrix = [[0.5, 0.3, 0.7], [0.7, 0.5, 0.4], [0.3, 0.6, 0.5]]
+    expected = cs.replicator_dynamics(game_matrix, iterations=50, samples=20)
+    assert np.allclose(cs.replicator_dynamics(game_matrix, iterations=50, samples=20, method="adaptive"), expected, atol=1e-4)
+    assert np.allclose(cs.replicator_dynamics(game_matrix, iterations=50, samples=20, method="discrete")[-1].sum(), 1)
+
+
+def test_batch_replicator_runs_match_single_runs():
+    game_matrix = np.array([[0.5, 0.3, 0.7], [0.7, 0.5, 0.4], [0.3, 0.6, 0.5]])
+    final_populations = cs.batch_replicator_dynamics(game_matrix, number_of_runs=4, iterations=200, rng=3)
+    starting_populations = np.random.default_rng(3).dirichlet(np.ones(3), size=4)
+    for run in range(0, 4):
+        single_run = cs.integrate_replicator_dynamics(game_matrix, populations=starting_populations[run], iterations=200, samples=2)
+        assert np.allclose(final_populations[run], single_run[-1], atol=1e-12)
+
+
+def test_moran_fixation_is_neutral_on_a_neutral_matrix():
+    for population_size in (2, 10, 50):
+        fixation_probability, fixation_time, absorption_time = cs.moran_fixation(np.full((2, 2), 0.5), 0, 1,
+                                                                                 population_size=population_size)
+        assert fixation_probability == pytest.approx(1 / population_size)
+        assert fixation_time == pytest.approx(population_size * (population_size - 1))
+        assert absorption_time <= fixation_time
+
+
+def test_results_store_round_trip(tmp_path):
+    path = str(tmp_path / "results_store")
+    strategies = [cs.short_term, cs.bi4nxt2]
+    matrix = cs.cached_interaction_matrix(strategies, sample_size=200, batch=True, seed=3, path=path)
+    assert len(os.listdir(path)) == 1
+    reloaded = cs.cached_interaction_matrix(strategies, sample_size=200, batch=True, seed=3, path=path)
+    assert isinstance(reloaded, np.memmap)
+    assert np.array_equal(matrix, reloaded)
+    assert np.array_equal(reloaded, cs.generate_interaction_matrix(strategies, sample_size=200, batch=True, rng=3))
+
+    cs.cached_interaction_matrix(strategies, sample_size=200, batch=True, seed=None, path=path)
+    cs.cached_interaction_matrix(strategies, sample_size=200, batch=True, seed=np.random.default_rng(3), path=path)
+    assert len(os.listdir(path)) == 1
+
+
+def test_game_log_columns_and_rows(tmp_path):
+    game_log = cs.log_games(cs.bi4nxt2, cs.short_term, str(tmp_path / "game_log"), m=300, chunk_size=120, rng=1)
+    assert {column: str(values.dtype) for column, values in game_log.items()} == cs.game_log_columns
+    rows = len(game_log["match_id"])
+    assert all(len(values) == rows for values in game_log.values())
+    # there is one row per round, and every accurate game ends with a player on 13 round wins.
+    rounds = np.bincount(game_log["match_id"], minlength=300)
+    player1_wins = np.bincount(game_log["match_id"], weights=game_log["player1_won"], minlength=300)
+    assert len(rounds) == 300 and rounds.sum() == rows
+    assert np.all(np.maximum(player1_wins, rounds - player1_wins) == 13)
+
+
+def test_accurate_game_stops_at_13_and_swaps_sides_at_12():
+    for seed in range(0, 20):
+        points_over_time, money_over_time = cs.accurate_cs_game(cs.random_strat, cs.bi4nxt2, rng=seed)
+        assert max(points_over_time[-1]) == 13 and max(points_over_time[-2]) == 12
+        assert len(cs.accurate_cs_game.player1choices[0]) == 12
+        assert money_over_time[12] == [1, 1]
+
+
+def test_loss_bonuses_off_and_large_starting_loss_bonus():
+    # both of these raised IndexError while loss bonuses were turned off by cutting the loss bonus ladder down.
+    points, money = cs.two_player_game(cs.short_term, cs.save_til_death, loss_bonuses=False, start_loss_bonus=2, rng=1, history="final")
+    assert max(points) == 13
+    points, money = cs.two_player_game(cs.short_term, cs.save_til_death, start_loss_bonus=5, rng=1, history="final")
+    assert max(points) == 13
+    for loss_bonuses in (False, True):
+        points, money = cs.batch_two_player_game(cs.short_term, cs.save_til_death, m=50, loss_bonuses=loss_bonuses, start_loss_bonus=5, 
+                                                 rng=1)
+        assert np.all(points.max(axis=1) == 13)
+        final_distribution = cs.markov_two_player_game(cs.short_term, cs.save_til_death, {(0, 0, 1, 1, 2, 2): 1.0}, 
+                                                       loss_bonuses=loss_bonuses)
+        assert sum(final_distribution.values()) == pytest.approx(1)
+
+
+def test_loss_bonuses_off_keep_the_starting_loss_bonus():
+    # save_til_death always saves, so without loss bonuses every round it loses gains the save's loss reward at its starting loss bonus.
+    points_over_time, money_over_time = cs.two_player_game(cs.short_term, cs.save_til_death, loss_bonuses=False, start_loss_bonus=2, 
+                                                           max_money=100, rng=1)
+    player2_lost = np.diff(np.array(points_over_time)[:, 0]) == 1
+    assert np.all(np.diff(np.array(money_over_time)[:, 1])[player2_lost] == 1.5 + 1)
+
+
+def test_exact_win_probability_uses_the_ruleset():
+    games = 10_000
+    exact = cs.exact_win_probability(cs.bi4nxt2, cs.short_term, accurate_game=True, ruleset=cs.casual_ruleset)
+    batch = cs.play_m_games(cs.bi4nxt2, cs.short_term, m=games, accurate_game=True, batch=True, rng=5, ruleset=cs.casual_ruleset)
+    assert_close_to_probability(batch[0], games, exact[0])
+
+
+def test_batch_strategies_match_strategies():
+    for player_strat in [cs.short_term, cs.save_til_n_eco2, cs.save_first_n_rounds2, cs.save_if_down_on_money2, cs.bi4nxt2, cs.never_half2]:
+        for round_number, eco, op_eco, player0_or_1, losses_bonus1, losses_bonus2, first_half in strategy_states():
+            game_matrix = cs.gen_opts(eco, op_eco) if player0_or_1 == 0 else cs.gen_opts(op_eco, eco)
+            expected = player_strat(round_number, eco, op_eco, game_matrix, player0_or_1, 5, losses_bonus1, losses_bonus2,
+                                    first_half=first_half)
+            batch = player_strat.batch_strategy(round_number, np.array([eco]), np.array([op_eco]), player0_or_1, 5, 
+                                                np.array([losses_bonus1]), np.array([losses_bonus2]), first_half)
+            assert batch[0].tolist() == pytest.approx(list(expected) + [0] * (4 - len(expected)))
+
+
+def test_pure_strategies_use_no_random_values():
+    def short_term_array(*args, **kwargs):
+        return np.array(cs.short_term(*args, **kwargs), dtype=float)
+
+    random.seed(3)
+    expected = cs.two_player_game(cs.short_term, cs.bi4nxt2)
+    random.seed(3)
+    assert cs.two_player_game(short_term_array, cs.bi4nxt2) == expected
+    assert cs.pure_choice([0, 0, 1]) == 2 and cs.pure_choice(np.array([0.0, 1.0])) == 1
+    assert cs.pure_choice([0.5, 0.5]) is None and cs.pure_choice(np.array([0.25, 0.75])) is None
+    # the batch engine only draws a value for the mixed row.
+    rng, reference_rng = np.random.default_rng(1), np.random.default_rng(1)
+    choices = cs.batch_draw_choices(np.array([[0, 1, 0, 0], [0.5, 0.5, 0, 0]]), np.array([4, 2]), rng=rng)
+    assert choices[0] == 1 and choices[1] == int(reference_rng.random() >= 0.5)
+    assert rng.random() == reference_rng.random()
+
+
+def test_profile_is_filled_in_under_the_profile_flag(tmp_path, capsys):
+    path = str(tmp_path / "profile.json")
+    cs.main(["matrix", "--strategies", "short_term", "bi4nxt2", "--sample-size", "50", "--seed", "1", "--profile", 
+             "--profile-output", path])
+    assert cs.profile_stats is None
+    with open(path) as file:
+        stats = json.load(file)
+    assert stats["pair"]["short_term vs bi4nxt2"]["calls"] == 50
+    assert stats["phase"]["play_game"]["calls"] == 50
+    assert {"game_strategies", "game_sampling", "game_update"} <= set(stats["phase"])
+    assert stats["strategy"]["bi4nxt2"]["calls"] == stats["phase"]["game_strategies"]["calls"]
+    assert "us per call" in capsys.readouterr().out